@@ -7,11 +7,201 @@ sources, including looping and fade-out effects.
 """
 
 import os
+import json
 import random
-import glob
-from moviepy.editor import AudioFileClip, concatenate_audioclips, CompositeAudioClip
-from moviepy.audio.fx.all import audio_fadeout
-from video_utils import make_silent_audio
+import subprocess
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from moviepy.config import get_setting
+from moviepy.editor import AudioFileClip
+from settings_manager import DB_DIR
+
+# Probed track durations are persisted alongside the settings database so
+# they survive container restarts.
+DURATION_CACHE_PATH = os.path.join(DB_DIR, "durations.json")
+
+
+def _ffprobe_binary():
+    """
+    Returns the ffprobe executable matching the configured ffmpeg binary.
+
+    ffprobe is looked for next to `FFMPEG_BINARY`, so a build outside the
+    PATH is probed with its own ffprobe. Falls back to `ffprobe` on the PATH
+    when there is no such file (e.g. imageio's bundled ffmpeg, which ships
+    without one).
+
+    Returns:
+        str: The path or name of the ffprobe executable.
+    """
+    ffmpeg = get_setting("FFMPEG_BINARY")
+    directory, name = os.path.split(ffmpeg)
+    if directory and "ffmpeg" in name:
+        ffprobe = os.path.join(directory, name.replace("ffmpeg", "ffprobe", 1))
+        if os.path.isfile(ffprobe):
+            return ffprobe
+    return "ffprobe"
+
+
+def _probe_duration(path):
+    """
+    Reads the duration of an audio file via ffprobe without decoding it.
+
+    Args:
+        path (str): The path to the audio file.
+
+    Returns:
+        float: The duration of the file in seconds.
+
+    Raises:
+        subprocess.CalledProcessError: If ffprobe cannot read the file.
+        ValueError: If ffprobe does not report a duration.
+    """
+    result = subprocess.run(
+        [_ffprobe_binary(), "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip())
+
+
+def _read_metadata(md_path):
+    """
+    Reads the attribution metadata from a track's `.md` file.
+
+    Args:
+        md_path (str): The path to the metadata file.
+
+    Returns:
+        tuple: (md_path, metadata_text), where metadata_text is None if
+               the file could not be read.
+    """
+    try:
+        with open(md_path, 'r', encoding='utf-8') as f:
+            return md_path, f.read()
+    except Exception as e:
+        print(f"Warning: Could not read metadata file {md_path}: {e}")
+        return md_path, None
+
+
+class DurationCache:
+    """
+    A persistent JSON cache of audio track durations.
+
+    Entries are keyed by absolute path and validated against the file's
+    size and modification time. Nextcloud tracks live at stable paths in
+    the download cache, where they are only rewritten when their ETag
+    changes. Changed files are simply re-probed, and entries for files that
+    no longer exist are dropped on save.
+
+    Attributes:
+        path (str): The location of the JSON cache file.
+    """
+    def __init__(self, path=DURATION_CACHE_PATH):
+        """
+        Initializes the cache, loading any existing entries from disk.
+
+        Args:
+            path (str, optional): The location of the JSON cache file.
+        """
+        self.path = path
+        self._entries = {}
+        self._dirty = False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            # Missing or corrupt cache; start empty
+            pass
+
+    @staticmethod
+    def _identify(track_path):
+        """Internal helper returning the (key, size, mtime_ns) a track is cached under."""
+        st = os.stat(track_path)
+        return os.path.abspath(track_path), st.st_size, st.st_mtime_ns
+
+    def _lookup(self, key, size, mtime_ns):
+        """Internal helper returning the cached duration, or None if stale or missing."""
+        entry = self._entries.get(key)
+        if entry and entry.get("size") == size and entry.get("mtime_ns") == mtime_ns:
+            return entry["duration"]
+        return None
+
+    def _store(self, key, size, mtime_ns, duration):
+        """Internal helper recording a probed duration."""
+        self._entries[key] = {"size": size, "mtime_ns": mtime_ns, "duration": duration}
+        self._dirty = True
+
+    def get_duration(self, track_path):
+        """
+        Returns the duration of a track, probing it only on a cache miss.
+
+        Args:
+            track_path (str): The path to the audio file.
+
+        Returns:
+            float: The duration of the track in seconds.
+        """
+        key, size, mtime_ns = self._identify(track_path)
+        duration = self._lookup(key, size, mtime_ns)
+        if duration is None:
+            duration = _probe_duration(track_path)
+            self._store(key, size, mtime_ns, duration)
+        return duration
+
+    def prefetch(self, track_paths, max_workers=8):
+        """
+        Probes all uncached tracks concurrently and stores their durations.
+
+        ffprobe runs as a subprocess, so probes overlap freely across threads.
+        Tracks that cannot be probed are skipped here and will raise again
+        when `get_duration` is called for them.
+
+        Args:
+            track_paths (list): Paths of the audio files to warm the cache for.
+            max_workers (int, optional): Maximum concurrent probes. Defaults to 8.
+        """
+        misses = []
+        for path in track_paths:
+            try:
+                key, size, mtime_ns = self._identify(path)
+            except OSError:
+                continue
+            if self._lookup(key, size, mtime_ns) is None:
+                misses.append((path, key, size, mtime_ns))
+
+        if not misses:
+            return
+
+        def probe(miss):
+            try:
+                return _probe_duration(miss[0])
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(misses))) as executor:
+            for (_, key, size, mtime_ns), duration in zip(misses, executor.map(probe, misses)):
+                if duration is not None:
+                    self._store(key, size, mtime_ns, duration)
+
+    def save(self):
+        """
+        Atomically writes the cache to disk if it has changed, dropping
+        entries for files that no longer exist.
+        """
+        if not self._dirty:
+            return
+        # Forget tracks that are gone, e.g. downloads to a temporary directory
+        self._entries = {key: entry for key, entry in self._entries.items() if os.path.exists(key)}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Warning: Could not save duration cache {self.path}: {e}")
+
 
 class AudioManager:
     """
@@ -25,6 +215,11 @@ class AudioManager:
         nextcloud_client (NextcloudClient, optional): An instance of NextcloudClient
                                                       to interact with Nextcloud. Defaults to None.
     """
+    # Music stops this many seconds before the end of the slideshow
+    MUSIC_END_PADDING = 5
+    # Length of the fade-out applied to the end of the music, in seconds
+    FADE_DURATION = 10
+
     def __init__(self, nextcloud_client=None):
         """
         Initializes the AudioManager.
@@ -34,14 +229,20 @@ class AudioManager:
                                                           instance. Defaults to None.
         """
         self.nextcloud_client = nextcloud_client
+        self.duration_cache = DurationCache()
 
-    def prepare_background_music(self, music_folder, music_source, target_duration, temp_dir_list):
+    def source_music_files(self, music_folder, music_source, temp_dir_list):
         """
-        Retrieves, selects, and processes background music to match the target video duration.
+        Retrieves the music tracks and their `.md` metadata files from local or Nextcloud.
+
+        Args:
+            music_folder (str): The local folder or Nextcloud path holding the music.
+            music_source (str): "local" or "nextcloud".
+            temp_dir_list (list): List to which any download directory is appended
+                                  for cleanup by the caller.
 
         Returns:
-            tuple: (AudioClip, list of attributions)
-                   Attributions is a list of tuples: (start_time, metadata_text)
+            list: Paths of the music and metadata files.
         """
         music_files = []
         temp_music_dir = None
@@ -55,83 +256,170 @@ class AudioManager:
             if temp_music_dir:
                 temp_dir_list.append(temp_music_dir)
         elif music_source == "local" and music_folder:
-            # Get local files
-            for ext in ('.mp3', '.md'):
-                music_files.extend(glob.glob(os.path.join(music_folder, f"*{ext}")))
-                music_files.extend(glob.glob(os.path.join(music_folder, f"*{ext.upper()}")))
+            # Get local files with a single, case-insensitive directory scan
+            exts = {'.mp3', '.md'}
+            with os.scandir(music_folder) as entries:
+                music_files = [
+                    e.path for e in entries
+                    if e.is_file() and os.path.splitext(e.name)[1].lower() in exts
+                ]
+        return music_files or []
+
+    def prepare_background_music(self, music_files, target_duration, temp_dir_list):
+        """
+        Selects and processes background music to match the target video duration.
+
+        Args:
+            music_files (list): Music and metadata files, from `source_music_files`.
+            target_duration (float): The duration of the slideshow in seconds.
+            temp_dir_list (list): List to which working directories are appended
+                                  for cleanup by the caller.
 
+        Returns:
+            tuple: (AudioClip, list of attributions)
+                   Attributions is a list of tuples: (start_time, metadata_text)
+        """
         if not music_files:
             print("No music files found.")
             return None, []
 
-        # Separate mp3 and md files
-        mp3_files = [f for f in music_files if f.lower().endswith('.mp3')]
-        md_files = [f for f in music_files if f.lower().endswith('.md')]
-        
-        # Link metadata to tracks
-        track_metadata = {}
-        for mp3 in mp3_files:
-            base_mp3 = os.path.splitext(os.path.basename(mp3))[0].lower()
-            md_match = next((md for md in md_files if os.path.splitext(os.path.basename(md))[0].lower() == base_mp3), None)
-            if md_match:
-                try:
-                    with open(md_match, 'r', encoding='utf-8') as f:
-                        track_metadata[mp3] = f.read()
-                except Exception as e:
-                    print(f"Warning: Could not read metadata file {md_match}: {e}")
-            else:
-                track_metadata[mp3] = None
+        # Separate mp3 and md files in a single pass, indexing metadata files
+        # by lower-cased base name so tracks can be linked with a dict lookup
+        mp3_files = []
+        md_by_base = {}
+        for f in music_files:
+            base, ext = os.path.splitext(os.path.basename(f))
+            ext = ext.lower()
+            if ext == '.mp3':
+                mp3_files.append(f)
+            elif ext == '.md':
+                md_by_base[base.lower()] = f
+
+        # Only the paths are linked here; files are read once the tracks are chosen
+        track_metadata = {
+            mp3: md_by_base.get(os.path.splitext(os.path.basename(mp3))[0].lower())
+            for mp3 in mp3_files
+        }
 
         print(f"Found {len(mp3_files)} music tracks. Creating background audio...")
         try:
-            selected_music = []
-            attributions = [] # List of (start_time, metadata_text)
+            selected_tracks = [] # List of track paths, in playback order
+            pending_attributions = [] # List of (start_time, md_path)
+            track_durations = {} # Durations of tracks seen this run, by path
             current_music_duration = 0
-            music_pool = list(mp3_files)
-            random.shuffle(music_pool)
+            playable_tracks = list(mp3_files)
+            random.shuffle(playable_tracks)
+            music_pool = deque(playable_tracks)
+
+            # Music is cut off MUSIC_END_PADDING seconds before the video ends,
+            # so only select enough tracks to cover that point.
+            audio_end = max(0, target_duration - self.MUSIC_END_PADDING)
 
-            while current_music_duration < target_duration + 30:
+            # Probe any uncached tracks in parallel before selecting
+            self.duration_cache.prefetch(playable_tracks)
+
+            # Select tracks using probed durations only; decoding is deferred
+            # until we know which tracks are actually needed.
+            while current_music_duration < audio_end and playable_tracks:
                 if not music_pool:
-                    music_pool = list(mp3_files)
-                    random.shuffle(music_pool)
+                    random.shuffle(playable_tracks)
+                    music_pool = deque(playable_tracks)
                 
-                track_path = music_pool.pop(0)
+                track_path = music_pool.popleft()
                 try:
-                    track = AudioFileClip(track_path)
-                    
-                    # Record attribution if metadata exists
-                    metadata = track_metadata.get(track_path)
-                    if metadata and current_music_duration < target_duration:
-                        attributions.append((current_music_duration, metadata))
-                    
-                    selected_music.append(track)
-                    current_music_duration += track.duration
+                    # Tracks repeat once the pool cycles; reuse their duration
+                    duration = track_durations.get(track_path)
+                    if duration is None:
+                        duration = self.duration_cache.get_duration(track_path)
+                        track_durations[track_path] = duration
                 except Exception as e:
                     print(f"Error loading music track {track_path}: {e}")
+                    # Drop unreadable tracks so a bad library cannot loop forever
+                    playable_tracks.remove(track_path)
+                    continue
+
+                # Record attribution if metadata exists
+                md_path = track_metadata.get(track_path)
+                if md_path and current_music_duration < target_duration:
+                    pending_attributions.append((current_music_duration, md_path))
+
+                selected_tracks.append(track_path)
+                current_music_duration += duration
 
-            if not selected_music:
+            self.duration_cache.save()
+
+            if not selected_tracks:
                 return None, []
 
-            # Concatenate all selected music clips
-            full_music = concatenate_audioclips(selected_music)
-            
-            # Fade out configuration
-            fade_duration = 10
-            audio_end = max(0, target_duration - 5)
-            
-            bg_music = full_music.subclip(0, audio_end).set_duration(audio_end)
-            
-            try:
-                bg_music = audio_fadeout(bg_music, fade_duration)
-            except Exception as e:
-                print(f"WARNING: audio_fadeout failed: {e}")
+            # Read only the metadata files for tracks that will actually play.
+            # Reads are I/O-bound (often on network mounts), so overlap them.
+            needed_md = {md for _, md in pending_attributions}
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                metadata_by_md = dict(executor.map(_read_metadata, needed_md))
+            attributions = [
+                (start_time, metadata_by_md[md]) # List of (start_time, metadata_text)
+                for start_time, md in pending_attributions
+                if metadata_by_md.get(md)
+            ]
 
-            full_silent_audio = make_silent_audio(target_duration)
-            slideshow_audio = CompositeAudioClip([full_silent_audio, bg_music])
-            slideshow_audio.duration = target_duration
+            slideshow_audio = self._render_background_track(selected_tracks, target_duration, temp_dir_list)
             
             return slideshow_audio, attributions
 
         except Exception as e:
             print(f"Error processing background music: {e}")
             return None, []
+
+    def _render_background_track(self, track_paths, target_duration, temp_dir_list):
+        """
+        Renders the finished background track with a single ffmpeg pass.
+
+        The selected tracks are resampled to a common format, joined with the
+        concat filter, trimmed to end MUSIC_END_PADDING seconds before the
+        video, faded out, and padded with silence to the full target duration.
+        This avoids mixing samples in Python at render time.
+
+        Args:
+            track_paths (list): Paths of the selected tracks, in playback order.
+            target_duration (float): The duration of the slideshow in seconds.
+            temp_dir_list (list): List to which the working directory is appended
+                                  for cleanup by the caller.
+
+        Returns:
+            AudioFileClip: A clip of the rendered stereo WAV file.
+
+        Raises:
+            subprocess.CalledProcessError: If ffmpeg fails to render the track.
+        """
+        work_dir = tempfile.mkdtemp()
+        temp_dir_list.append(work_dir)
+        output_path = os.path.join(work_dir, "background.wav")
+
+        # Tracks may differ in sample rate and channels, so each input is
+        # converted to 44.1 kHz stereo before they are joined.
+        inputs = []
+        streams = []
+        for i, path in enumerate(track_paths):
+            inputs += ["-i", path]
+            streams.append(f"[{i}:a]aresample=44100,aformat=channel_layouts=stereo[a{i}]")
+        joined = "".join(f"[a{i}]" for i in range(len(track_paths)))
+
+        audio_end = max(0, target_duration - self.MUSIC_END_PADDING)
+        fade_start = max(0, audio_end - self.FADE_DURATION)
+        audio_filter = ";".join(streams + [
+            f"{joined}concat=n={len(track_paths)}:v=0:a=1,"
+            f"atrim=end={audio_end},"
+            f"afade=t=out:st={fade_start}:d={audio_end - fade_start},"
+            f"apad=whole_dur={target_duration}[out]"
+        ])
+
+        subprocess.run(
+            [
+                get_setting("FFMPEG_BINARY"), "-y", "-v", "error", *inputs,
+                "-filter_complex", audio_filter, "-map", "[out]",
+                "-ac", "2", "-ar", "44100", output_path
+            ],
+            capture_output=True, check=True
+        )
+
+        return AudioFileClip(output_path).set_duration(target_duration)
@@ -6,10 +6,108 @@ plain text and HTML messages for the Matrix bot, keeping the
 main controller logic clean and focused.
 """
 
+import time
+import asyncio
+from datetime import datetime
+
+import cron_descriptor
+import croniter
+
 from version import __version__
-from nextcloud_client import NextcloudClient
+from config_manager import CONFIG_GROUPS, CONFIG_GROUPS_FILTERED
+from nextcloud_client import get_nextcloud_client
 from settings_manager import get_settings_manager
 
+# Precomputed !get all layout: (category heading, ((KEY, attribute name), ...)),
+# with (None, None) marking a spacer
+_GET_ALL_LAYOUT = tuple(
+    (
+        category.replace("**", ""),
+        tuple((key, key.lower() if key else None) for key in keys),
+    )
+    for category, keys in CONFIG_GROUPS.items()
+)
+
+_GET_ALL_LEGEND_TEXT = "\n\n🔹 = Runtime Override active\n▫️ = Using .env/calculated default"
+_GET_ALL_LEGEND_HTML = (
+    "<p><br/>🔹 = <font color='blue'>Runtime Override active</font><br/>"
+    "▫️ = <font color='green'>Using .env/calculated default</font></p>"
+)
+
+# How long (in seconds) a Nextcloud connectivity result is reused by !status
+NC_STATUS_TTL = 30
+
+# Upper bound (in seconds) on waiting for a Nextcloud ping to complete
+NC_PROBE_TIMEOUT = 3.0
+
+# Last Nextcloud connectivity result: credentials key, monotonic timestamp, outcome
+_nc_probe = {"key": None, "ts": 0, "ok": False}
+
+# Background task refreshing _nc_probe, if one is in flight
+_nc_refresh_task = None
+
+
+async def _refresh_nextcloud_status(creds):
+    """
+    Pings Nextcloud in a worker thread and records the outcome in `_nc_probe`.
+
+    The wait is capped at `NC_PROBE_TIMEOUT` seconds; a slower server is
+    reported as unreachable.
+    """
+    client = get_nextcloud_client(creds)
+    try:
+        ok = await asyncio.wait_for(asyncio.to_thread(client.ping, timeout=2.0), timeout=NC_PROBE_TIMEOUT)
+    except Exception: # Timed out, or the client failed unexpectedly
+        ok = False
+    _nc_probe.update(key=creds, ts=time.monotonic(), ok=ok)
+
+
+async def update_nextcloud_status(creds):
+    """
+    Makes a Nextcloud connectivity result available to `format_status`.
+
+    The first check for a set of credentials is awaited. After that the
+    last result is served immediately and, once it is older than
+    `NC_STATUS_TTL` seconds, refreshed by a background task so the next
+    !status sees fresh data (stale-while-revalidate).
+
+    Args:
+        creds (tuple): (url, username, password, verify_ssl), as in `Config.nc_creds`.
+    """
+    global _nc_refresh_task
+    if _nc_probe["key"] != creds:
+        await _refresh_nextcloud_status(creds)
+    elif time.monotonic() - _nc_probe["ts"] >= NC_STATUS_TTL:
+        if _nc_refresh_task is None or _nc_refresh_task.done():
+            _nc_refresh_task = asyncio.create_task(_refresh_nextcloud_status(creds))
+
+
+def describe_cron(value):
+    """
+    Annotates a cron expression with a readable description and its next run.
+
+    Args:
+        value (str): The cron expression.
+
+    Returns:
+        str: e.g. "0 1 * * 5 (At 01:00 AM, only on Friday) [Next Run: ...]",
+             or the expression unchanged if it cannot be parsed.
+    """
+    try:
+        desc = cron_descriptor.get_description(value)
+        
+        # Calculate next run time
+        next_run = croniter.croniter(value, datetime.now()).get_next(datetime)
+        
+        # Format as Next Run: YYYY-MM-DD HH:MM:SS
+        time_str = next_run.strftime('%Y-%m-%d %H:%M:%S')
+        
+        return f"{value} ({desc}) [Next Run: {time_str}]"
+    except Exception as e:
+        print(f"Error parsing cron for display: {e}")
+        return value
+
+
 class BotInterface:
     """
     Generates formatted messages for the Matrix bot.
@@ -21,42 +119,31 @@ class BotInterface:
         Formats the !status response.
         Returns (plain_text, html_message)
         """
-        # Plain text version (no **)
-        status_msg = (
-            "🤖 Slideshow Bot Status\n"
-            f"🏷️ Version: {__version__}\n"
-            f"⏱️ Uptime: {stats['uptime']}\n"
-            f"📅 Next Run: {stats['next_run']}\n"
-            f"✅ Last Success: {stats['last_success']}\n"
-            f"💓 Heartbeat Active: {'Yes' if stats['heartbeat_active'] else 'No'}\n"
-        )
-        
-        # HTML version (proper bolding)
-        html_msg = (
-            "🤖 <b>Slideshow Bot Status</b><br/>"
-            f"🏷️ <b>Version</b>: {__version__}<br/>"
-            f"⏱️ <b>Uptime</b>: {stats['uptime']}<br/>"
-            f"📅 <b>Next Run</b>: {stats['next_run']}<br/>"
-            f"✅ <b>Last Success</b>: {stats['last_success']}<br/>"
-            f"💓 <b>Heartbeat Active</b>: {'Yes' if stats['heartbeat_active'] else 'No'}<br/>"
-        )
+        # Plain text (no **) and HTML (proper bolding) parts, joined once at the end
+        status_parts = [
+            "🤖 Slideshow Bot Status\n",
+            f"🏷️ Version: {__version__}\n",
+            f"⏱️ Uptime: {stats['uptime']}\n",
+            f"📅 Next Run: {stats['next_run']}\n",
+            f"✅ Last Success: {stats['last_success']}\n",
+            f"💓 Heartbeat Active: {'Yes' if stats['heartbeat_active'] else 'No'}\n",
+        ]
+        html_parts = [
+            "🤖 <b>Slideshow Bot Status</b><br/>",
+            f"🏷️ <b>Version</b>: {__version__}<br/>",
+            f"⏱️ <b>Uptime</b>: {stats['uptime']}<br/>",
+            f"📅 <b>Next Run</b>: {stats['next_run']}<br/>",
+            f"✅ <b>Last Success</b>: {stats['last_success']}<br/>",
+            f"💓 <b>Heartbeat Active</b>: {'Yes' if stats['heartbeat_active'] else 'No'}<br/>",
+        ]
         
-        # Quick Nextcloud Connectivity Check
-        if config.nc_url and config.nc_user:
-            nc_status = "Connection Failed"
-            try:
-                NextcloudClient(
-                    config.nc_url, 
-                    config.nc_user, 
-                    config.nc_pass, 
-                    verify_ssl=not config.nc_insecure
-                )
-                nc_status = "Connected"
-            except Exception:
-                nc_status = "❌ Connection Failed"
+        # Nextcloud connectivity, as last recorded by update_nextcloud_status()
+        if config.nc_creds:
+            nc_ok = _nc_probe["key"] == config.nc_creds and _nc_probe["ok"]
+            nc_status = "Connected" if nc_ok else "❌ Connection Failed"
             
-            status_msg += f"☁️ Nextcloud: {nc_status}\n"
-            html_msg += f"☁️ <b>Nextcloud</b>: {nc_status}<br/>"
+            status_parts.append(f"☁️ Nextcloud: {nc_status}\n")
+            html_parts.append(f"☁️ <b>Nextcloud</b>: {nc_status}<br/>")
 
         # Show active task if something is running
         if stats.get('active_stage'):
@@ -64,25 +151,25 @@ class BotInterface:
             progress = stats.get('progress', 0)
             start_time = stats.get('job_start_time', 'Unknown')
             
-            status_msg += (
-                f"\n🚀 Current Activity: {stats['active_stage']}\n"
-                f"📅 Started At: {start_time}\n"
-                f"📝 Task: {task}\n"
-            )
+            status_parts.extend([
+                f"\n🚀 Current Activity: {stats['active_stage']}\n",
+                f"📅 Started At: {start_time}\n",
+                f"📝 Task: {task}\n",
+            ])
             
-            html_msg += (
-                f"<br/>🚀 <b>Current Activity</b>: {stats['active_stage']}<br/>"
-                f"📅 <b>Started At</b>: {start_time}<br/>"
-                f"📝 <b>Task</b>: {task}<br/>"
-            )
+            html_parts.extend([
+                f"<br/>🚀 <b>Current Activity</b>: {stats['active_stage']}<br/>",
+                f"📅 <b>Started At</b>: {start_time}<br/>",
+                f"📝 <b>Task</b>: {task}<br/>",
+            ])
             
             if progress > 0:
                 bars = progress // 10
                 progress_bar = "▓" * bars + "░" * (10 - bars)
-                status_msg += f"📊 Progress: [{progress_bar}] {progress}%\n"
-                html_msg += f"📊 <b>Progress</b>: [{progress_bar}] {progress}%<br/>"
+                status_parts.append(f"📊 Progress: [{progress_bar}] {progress}%\n")
+                html_parts.append(f"📊 <b>Progress</b>: [{progress_bar}] {progress}%<br/>")
         
-        return status_msg, html_msg
+        return "".join(status_parts), "".join(html_parts)
 
     @staticmethod
     def format_full_config(config):
@@ -95,43 +182,23 @@ class BotInterface:
         lines = ["📋 Full Configuration Status\n"]
         html_lines = ["<h3>📋 Full Configuration Status</h3>"]
         
-        for category, keys in config.CONFIG_GROUPS.items():
-            cat_clean = category.replace("**", "")
+        for cat_clean, entries in _GET_ALL_LAYOUT:
             lines.append(f"\n{cat_clean}")
             html_lines.append(f"<h4>{cat_clean}</h4>")
             
-            for key in keys:
+            for key, attr in entries:
                 if key is None:
                     lines.append("")
                     html_lines.append("<br/>")
                     continue
                     
-                value = getattr(config, key.lower(), "Not set")
+                value = getattr(config, attr, "Not set")
                 is_override = key in overrides
                 marker = "🔹" if is_override else "▫️"
                 status = "(Override)" if is_override else "(Default)"
                 
-                if key.upper() == "CRON_SCHEDULE" and value != "Not set":
-                    try:
-                        import cron_descriptor
-                        import croniter
-                        from datetime import datetime
-                        
-                        desc = cron_descriptor.get_description(value)
-                        
-                        # Calculate next run time
-                        now = datetime.now()
-                        iter = croniter.croniter(value, now)
-                        next_run = iter.get_next(datetime)
-                        
-                        # Format as Next Run: YYYY-MM-DD HH:MM:SS
-                        time_str = next_run.strftime('%Y-%m-%d %H:%M:%S')
-                        
-                        value = f"{value} ({desc}) [Next Run: {time_str}]"
-                    except Exception as e:
-                        print(f"Error parsing cron for display: {e}")
-                        pass
-                
+                if key == "CRON_SCHEDULE" and value != "Not set":
+                    value = describe_cron(value)
                 
                 # Plain text version
                 lines.append(f"{marker} {key}: {value} {status}")
@@ -142,18 +209,31 @@ class BotInterface:
                     f"{marker} <font color='{color}'><b>{key}</b></font>: {value} <i>{status}</i><br/>"
                 )
         
-        lines.append("\n\n🔹 = Runtime Override active")
-        lines.append("▫️ = Using .env/calculated default")
-        
-        html_lines.append("<p><br/>🔹 = <font color='blue'>Runtime Override active</font><br/>")
-        html_lines.append("▫️ = <font color='green'>Using .env/calculated default</font></p>")
+        lines.append(_GET_ALL_LEGEND_TEXT)
+        html_lines.append(_GET_ALL_LEGEND_HTML)
         
         return "\n".join(lines), "".join(html_lines)
 
     @staticmethod
-    def format_help(config):
+    def format_help():
         """
         Formats the !help response with categorized settings in columns.
+
+        The setting groups are static, so both bodies are rendered once at
+        import and served from memory.
+        """
+        return _HELP_TEXT, _HELP_HTML
+
+    @staticmethod
+    def _render_help(groups):
+        """
+        Renders the !help plain text and HTML bodies for the given setting groups.
+
+        Args:
+            groups (tuple): Tuple of (category, keys) pairs mirroring CONFIG_GROUPS_FILTERED.
+
+        Returns:
+            tuple: (plain_text, html_message)
         """
         # Build Plain Text Help
         help_text = (
@@ -172,24 +252,25 @@ class BotInterface:
             "📝 Configurable Settings:\n"
         )
         
-        for category, keys in config.CONFIG_GROUPS.items():
-            valid_keys = [k for k in keys if k is not None]
+        help_parts = [help_text]
+        for category, valid_keys in groups:
             cat_clean = category.replace("**", "")
-            help_text += f"\n{cat_clean}\n"
-            help_text += ", ".join([f"`{k}`" for k in valid_keys]) + "\n"
+            help_parts.append(f"\n{cat_clean}\n")
+            help_parts.append(", ".join([f"`{k}`" for k in valid_keys]) + "\n")
+        help_text = "".join(help_parts)
 
         # Build HTML Help
-        settings_html = ""
-        for category, keys in config.CONFIG_GROUPS.items():
-            valid_keys = [k for k in keys if k is not None]
+        settings_parts = []
+        for category, valid_keys in groups:
             cat_name = category.replace("**", "")
-            settings_html += f"<h4>{cat_name}</h4>"
-            settings_html += "<table style='width:100%'>"
+            settings_parts.append(f"<h4>{cat_name}</h4>")
+            settings_parts.append("<table style='width:100%'>")
             for i in range(0, len(valid_keys), 2):
                 col1 = valid_keys[i]
                 col2 = valid_keys[i+1] if i+1 < len(valid_keys) else ""
-                settings_html += f"<tr><td><code>{col1}</code></td><td>{f'<code>{col2}</code>' if col2 else ''}</td></tr>"
-            settings_html += "</table>"
+                settings_parts.append(f"<tr><td><code>{col1}</code></td><td>{f'<code>{col2}</code>' if col2 else ''}</td></tr>")
+            settings_parts.append("</table>")
+        settings_html = "".join(settings_parts)
 
         html_help = (
             "<h3>🤖 Slideshow Bot Help</h3>"
@@ -215,3 +296,7 @@ class BotInterface:
         )
         
         return help_text, html_help
+
+
+# Pre-rendered !help bodies (plain text, HTML)
+_HELP_TEXT, _HELP_HTML = BotInterface._render_help(tuple(CONFIG_GROUPS_FILTERED.items()))
@@ -8,9 +8,15 @@ via the settings database.
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
+from apscheduler.triggers.cron import CronTrigger
 from settings_manager import get_settings_manager
 
-def get_env_var(name, default=None, required=False):
+# Characters trimmed from both ends of configuration values in a single pass
+_STRIP_CHARS = " \t\r\n\"'"
+
+def get_env_var(name, default=None, required=False, env=None):
     """
     Retrieves a configuration value, checking the database first, then environment variables.
     
@@ -22,6 +28,8 @@ def get_env_var(name, default=None, required=False):
         default (str, optional): The default value if the variable is not set. Defaults to None.
         required (bool, optional): If True, raises a ValueError if the variable is not set
                                    and no default is provided. Defaults to False.
+        env (dict, optional): A snapshot of the environment to read from instead of
+                              `os.environ`. Defaults to None.
 
     Returns:
         str: The value of the configuration variable, or the default value.
@@ -37,34 +45,32 @@ def get_env_var(name, default=None, required=False):
         value = db_value
     else:
         # Fall back to environment variable
-        value = os.getenv(name, default)
+        value = (os.environ if env is None else env).get(name, default)
     
     if value is not None:
-        # Strip potential quotes from environment variable values
-        value = value.strip().strip('"').strip("'")
+        # Strip whitespace and potential quotes from environment variable values
+        value = value.strip(_STRIP_CHARS)
     if required and value is None:
         raise ValueError(f"Configuration variable '{name}' is required but not set.")
     return value
 
 
-def get_env_int(name, default):
+def get_env_int(name, default, env=None):
     """
     Retrieves an environment variable as an integer, with a default fallback.
 
     Args:
         name (str): The name of the environment variable.
         default (int): The default integer value if the variable is not set or invalid.
+        env (dict, optional): A snapshot of the environment to read from. Defaults to None.
 
     Returns:
         int: The integer value of the environment variable, or the default.
     """
-    try:
-        return int(get_env_var(name, default=str(default)))
-    except (ValueError, TypeError):
-        return default
+    return _parse_int(get_env_var(name, default=str(default), env=env), default)
 
 
-def get_env_bool(name, default=False):
+def get_env_bool(name, default=False, env=None):
     """
     Retrieves an environment variable as a boolean, with a default fallback.
 
@@ -73,11 +79,141 @@ def get_env_bool(name, default=False):
     Args:
         name (str): The name of the environment variable.
         default (bool): The default boolean value if the variable is not set.
+        env (dict, optional): A snapshot of the environment to read from. Defaults to None.
 
     Returns:
         bool: The boolean value of the environment variable, or the default.
     """
-    return get_env_var(name, str(default)).lower() == "true"
+    return _parse_bool(get_env_var(name, str(default), env=env))
+
+
+@lru_cache(maxsize=128)
+def _parse_int(value, default):
+    """
+    Converts a raw setting string to an int, memoized on the raw value.
+
+    Args:
+        value (str): The raw setting value.
+        default (int): Returned if the value is not a valid integer.
+
+    Returns:
+        int: The parsed integer, or the default.
+    """
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+@lru_cache(maxsize=128)
+def _parse_bool(value):
+    """
+    Converts a raw setting string to a bool, memoized on the raw value.
+
+    Args:
+        value (str): The raw setting value.
+
+    Returns:
+        bool: True if the value is "true" (case-insensitive), False otherwise.
+    """
+    return value.lower() == "true"
+
+
+@lru_cache(maxsize=16)
+def get_apscheduler_trigger(cron_str):
+    """
+    Creates an APScheduler CronTrigger from a standard crontab string.
+    
+    Translates the 5th field (weekday) from crontab standard (0,7=Sun, 1=Mon, ..., 6=Sat)
+    to APScheduler standard (0=Mon, 1=Tue, ..., 6=Sun).
+
+    Parsed triggers are memoized per schedule string; CronTrigger holds no
+    per-job state, so one instance can be shared.
+    """
+    parts = cron_str.split()
+    if len(parts) >= 5:
+        weekday = parts[4]
+        
+        # Mapping: Crontab (0-7, 0/7=Sun) -> APScheduler (0-6, 0=Mon, 6=Sun)
+        # Translation table: 
+        # 1 -> 0 (Mon)
+        # 2 -> 1 (Tue)
+        # 3 -> 2 (Wed)
+        # 4 -> 3 (Thu)
+        # 5 -> 4 (Fri)
+        # 6 -> 5 (Sat)
+        # 0, 7 -> 6 (Sun)
+        
+        mapping = {
+            "1": "0", "2": "1", "3": "2", "4": "3", "5": "4", "6": "5", "0": "6", "7": "6",
+            "MON": "0", "TUE": "1", "WED": "2", "THU": "3", "FRI": "4", "SAT": "5", "SUN": "6"
+        }
+        
+        if weekday.upper() in mapping:
+            parts[4] = mapping[weekday.upper()]
+        elif "-" in weekday:
+            # Handle simple ranges like 1-5
+            r_parts = weekday.split("-")
+            if len(r_parts) == 2 and r_parts[0] in mapping and r_parts[1] in mapping:
+                parts[4] = f"{mapping[r_parts[0].upper()]}-{mapping[r_parts[1].upper()]}"
+        
+        resolved_cron = " ".join(parts)
+        return CronTrigger.from_crontab(resolved_cron)
+    
+    return CronTrigger.from_crontab(cron_str)
+
+
+def _setting(name, default=None, getter=get_env_var):
+    """
+    Builds a read-only `Config` property for a single configuration variable.
+
+    The value is resolved on every access against the instance's environment
+    snapshot, so database overrides still take effect immediately.
+
+    Args:
+        name (str): The name of the configuration variable.
+        default (optional): The default value passed to `getter`.
+        getter (callable, optional): One of `get_env_var`, `get_env_int` or
+                                     `get_env_bool`. Defaults to `get_env_var`.
+
+    Returns:
+        property: The property object to assign on the class.
+    """
+    return property(lambda self: getter(name, default, env=self._env))
+
+
+# --- Metadata for Bot UI ---
+# Logical grouping of settings for !help and !get all (None marks a spacer)
+CONFIG_GROUPS = {
+    "⚙️ **General**": ["IMAGE_DURATION", "TARGET_VIDEO_DURATION", "CRON_SCHEDULE", "TRANSITION_ENABLED", "TRANSITION_DURATION"],
+    "☁️ **Nextcloud**": [
+        "NEXTCLOUD_UPLOAD_PATH", 
+        None,
+        "IMAGE_SOURCE", 
+        "NEXTCLOUD_IMAGE_PATH", 
+        None,
+        "MUSIC_SOURCE", 
+        "MUSIC_FOLDER", 
+        None,
+        "APPEND_VIDEO_SOURCE", 
+        "APPEND_VIDEO_PATH"
+    ],
+    "⏱️ **Timer Settings**": ["ENABLE_TIMER", "TIMER_MINUTES", "TIMER_POSITION"],
+    "🎞️ **Encoding**": ["X264_PRESET", "X264_THREADS"],
+    "💓 **Heartbeat**": ["ENABLE_HEARTBEAT"],
+    "🔔 **NTFY**": ["ENABLE_NTFY", "NTFY_TOPIC"]
+}
+
+# Per-category keys with spacers (None) filtered out, for list-style displays
+CONFIG_GROUPS_FILTERED = {
+    category: tuple(k for k in keys if k is not None)
+    for category, keys in CONFIG_GROUPS.items()
+}
+
+# Flattened set for O(1) validation of setting names
+CONFIGURABLE_SETTINGS = frozenset(
+    k for keys in CONFIG_GROUPS_FILTERED.values() for k in keys
+)
 
 
 class Config:
@@ -94,161 +230,130 @@ class Config:
     
     Users mount volumes to these paths and use SOURCE variables to select local vs Nextcloud.
     """
+    # --- Metadata for Bot UI (built once at import) ---
+    CONFIG_GROUPS = CONFIG_GROUPS
+    CONFIG_GROUPS_FILTERED = CONFIG_GROUPS_FILTERED
+    CONFIGURABLE_SETTINGS = CONFIGURABLE_SETTINGS
+
+    # Settings are class-level properties, so instances only carry these fields
+    __slots__ = (
+        "_env",
+        "image_folder",
+        "output_folder",
+        "output_filepath",
+        "nc_creds",
+    )
+
     def __init__(self):
         """
-        Initializes the Config object. Metadata for UI and groups is static.
+        Initializes the Config object. Metadata for UI and groups is static
+        and shared via class attributes.
         """
-        # --- Metadata for Bot UI ---
-        # Logical grouping of settings for !help and !get all
-        self.CONFIG_GROUPS = {
-            "⚙️ **General**": ["IMAGE_DURATION", "TARGET_VIDEO_DURATION", "CRON_SCHEDULE", "TRANSITION_ENABLED", "TRANSITION_DURATION"],
-            "☁️ **Nextcloud**": [
-                "NEXTCLOUD_UPLOAD_PATH", 
-                None,
-                "IMAGE_SOURCE", 
-                "NEXTCLOUD_IMAGE_PATH", 
-                None,
-                "MUSIC_SOURCE", 
-                "MUSIC_FOLDER", 
-                None,
-                "APPEND_VIDEO_SOURCE", 
-                "APPEND_VIDEO_PATH"
-            ],
-            "⏱️ **Timer Settings**": ["ENABLE_TIMER", "TIMER_MINUTES", "TIMER_POSITION"],
-            "💓 **Heartbeat**": ["ENABLE_HEARTBEAT"],
-            "🔔 **NTFY**": ["ENABLE_NTFY", "NTFY_TOPIC"]
-        }
-        
-        # Flattened list for validation, filtering out spacers (None)
-        self.CONFIGURABLE_SETTINGS = []
-        for keys in self.CONFIG_GROUPS.values():
-            self.CONFIGURABLE_SETTINGS.extend([k for k in keys if k is not None])
+        # Snapshot the environment once into a plain, read-only mapping;
+        # settings read from it rather than going through the os.environ
+        # proxy on every property access.
+        self._env = MappingProxyType(os.environ.copy())
 
         # Hardcoded container paths - these do not change at runtime
         self.image_folder = "/app/images"
         self.output_folder = "/app/output"
         self.output_filepath = "/app/output/slideshow.mp4"
 
+        # Nextcloud connection details can't be overridden with !set, so they
+        # are resolved once: (url, username, password, verify_ssl), or None.
+        nc_url, nc_user = self.nc_url, self.nc_user
+        self.nc_creds = (nc_url, nc_user, self.nc_pass, not self.nc_insecure) if nc_url and nc_user else None
+
     @property
     def images_folder(self):
         """Alias for image_folder used by VideoEngine."""
         return self.image_folder
 
     # --- Dynamic Properties ---
-    # These call get_env_var/int/bool every time, ensuring hot-reloading from DB
-
-    @property
-    def image_duration(self):
-        return get_env_int("IMAGE_DURATION", 10)
-
-    @property
-    def target_video_duration(self):
-        return get_env_int("TARGET_VIDEO_DURATION", 600)
+    # These resolve through get_env_var/int/bool on every access, ensuring hot-reloading from DB
 
-    @property
-    def music_folder(self):
-        return get_env_var("MUSIC_FOLDER", "/app/music")
-
-    @property
-    def nc_url(self):
-        return get_env_var("NEXTCLOUD_URL")
+    image_duration = _setting("IMAGE_DURATION", 10, get_env_int)
+    target_video_duration = _setting("TARGET_VIDEO_DURATION", 600, get_env_int)
+    music_folder = _setting("MUSIC_FOLDER", "/app/music")
 
-    @property
-    def nc_user(self):
-        return get_env_var("NEXTCLOUD_USERNAME")
+    nc_url = _setting("NEXTCLOUD_URL")
+    nc_user = _setting("NEXTCLOUD_USERNAME")
+    nc_pass = _setting("NEXTCLOUD_PASSWORD")
+    nextcloud_image_path = _setting("NEXTCLOUD_IMAGE_PATH")
+    nextcloud_upload_path = _setting("NEXTCLOUD_UPLOAD_PATH")
+    nc_insecure = _setting("NEXTCLOUD_INSECURE_SSL", False, get_env_bool)
 
-    @property
-    def nc_pass(self):
-        return get_env_var("NEXTCLOUD_PASSWORD")
+    append_video_path = _setting("APPEND_VIDEO_PATH")
 
-    @property
-    def nextcloud_image_path(self):
-        return get_env_var("NEXTCLOUD_IMAGE_PATH")
+    matrix_homeserver = _setting("MATRIX_HOMESERVER")
+    matrix_token = _setting("MATRIX_ACCESS_TOKEN")
+    matrix_room = _setting("MATRIX_ROOM_ID")
+    matrix_user_id = _setting("MATRIX_USER_ID")
 
-    @property
-    def nextcloud_upload_path(self):
-        return get_env_var("NEXTCLOUD_UPLOAD_PATH")
-
-    @property
-    def nc_insecure(self):
-        return get_env_bool("NEXTCLOUD_INSECURE_SSL", False)
-
-    @property
-    def image_source(self):
-        return get_env_var("IMAGE_SOURCE", "nextcloud" if self.nextcloud_image_path else "local")
-
-    @property
-    def music_source(self):
-        return get_env_var("MUSIC_SOURCE", "nextcloud" if self.nextcloud_image_path else "local")
-
-    @property
-    def append_video_path(self):
-        return get_env_var("APPEND_VIDEO_PATH")
+    ntfy_url = _setting("NTFY_URL")
+    ntfy_topic = _setting("NTFY_TOPIC")
+    ntfy_token = _setting("NTFY_TOKEN")
+    enable_heartbeat_ntfy = _setting("ENABLE_HEARTBEAT_NTFY", True, get_env_bool)
+    enable_ntfy = _setting("ENABLE_NTFY", True, get_env_bool)
 
-    @property
-    def append_video_source(self):
-        return get_env_var("APPEND_VIDEO_SOURCE", "nextcloud" if self.append_video_path and self.nc_url else "local")
+    cron_schedule = _setting("CRON_SCHEDULE", "0 1 * * 5")
+    enable_heartbeat = _setting("ENABLE_HEARTBEAT", True, get_env_bool)
 
-    @property
-    def matrix_homeserver(self):
-        return get_env_var("MATRIX_HOMESERVER")
+    enable_timer = _setting("ENABLE_TIMER", False, get_env_bool)
+    timer_minutes = _setting("TIMER_MINUTES", 5, get_env_int)
+    timer_position = _setting("TIMER_POSITION", "auto")
 
-    @property
-    def matrix_token(self):
-        return get_env_var("MATRIX_ACCESS_TOKEN")
+    transition_enabled = _setting("TRANSITION_ENABLED", False, get_env_bool)
+    transition_duration = _setting("TRANSITION_DURATION", 1, get_env_int)
 
-    @property
-    def matrix_room(self):
-        return get_env_var("MATRIX_ROOM_ID")
+    x264_preset = _setting("X264_PRESET", "veryfast")
+    x264_threads = _setting("X264_THREADS", 0, get_env_int)
 
     @property
-    def matrix_user_id(self):
-        return get_env_var("MATRIX_USER_ID")
+    def cron_trigger(self):
+        """
+        The APScheduler trigger for `cron_schedule`, parsed once per schedule.
 
-    @property
-    def ntfy_url(self):
-        return get_env_var("NTFY_URL")
+        Raises:
+            ValueError: If the schedule is not a valid crontab expression.
+        """
+        return get_apscheduler_trigger(self.cron_schedule)
 
-    @property
-    def ntfy_topic(self):
-        return get_env_var("NTFY_TOPIC")
+    # --- Derived Defaults ---
+    # These fall back to a value computed from other settings
 
     @property
-    def ntfy_token(self):
-        return get_env_var("NTFY_TOKEN")
+    def image_source(self):
+        return get_env_var("IMAGE_SOURCE", "nextcloud" if self.nextcloud_image_path else "local", env=self._env)
 
     @property
-    def enable_heartbeat_ntfy(self):
-        return get_env_bool("ENABLE_HEARTBEAT_NTFY", True)
+    def music_source(self):
+        return get_env_var("MUSIC_SOURCE", "nextcloud" if self.nextcloud_image_path else "local", env=self._env)
 
     @property
-    def enable_ntfy(self):
-        return get_env_bool("ENABLE_NTFY", True)
+    def append_video_source(self):
+        return get_env_var("APPEND_VIDEO_SOURCE", "nextcloud" if self.append_video_path and self.nc_url else "local", env=self._env)
 
-    @property
-    def cron_schedule(self):
-        return get_env_var("CRON_SCHEDULE", "0 1 * * 5")
 
-    @property
-    def enable_heartbeat(self):
-        return get_env_bool("ENABLE_HEARTBEAT", True)
+# Global instance for easy access
+_config = None
 
-    @property
-    def enable_timer(self):
-        return get_env_bool("ENABLE_TIMER", False)
 
-    @property
-    def timer_minutes(self):
-        return get_env_int("TIMER_MINUTES", 5)
+def get_config(force_reload=False):
+    """
+    Returns the global Config instance.
 
-    @property
-    def timer_position(self):
-        return get_env_var("TIMER_POSITION", "auto")
+    Settings are still resolved on every property access, so the shared
+    instance always reflects database overrides; reloading only refreshes
+    the environment snapshot.
 
-    @property
-    def transition_enabled(self):
-        return get_env_bool("TRANSITION_ENABLED", False)
+    Args:
+        force_reload (bool, optional): If True, builds a fresh Config. Defaults to False.
 
-    @property
-    def transition_duration(self):
-        return get_env_int("TRANSITION_DURATION", 1)
+    Returns:
+        Config: The global configuration instance.
+    """
+    global _config
+    if _config is None or force_reload:
+        _config = Config()
+    return _config
@@ -8,26 +8,31 @@ and video production.
 """
 
 import asyncio
+import contextlib
+import logging
+import logging.handlers
 import os
+import queue
+import re
+import signal
+import sys
 import time
 import traceback
 import tempfile
-from datetime import datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from dotenv import load_dotenv
 
 # Internal Modules
-from config_manager import Config, get_env_var, get_env_bool
+from config_manager import get_config, get_env_var, get_env_bool, get_apscheduler_trigger, CONFIGURABLE_SETTINGS
 from health_manager import HealthManager
 from video_engine import VideoEngine
 from matrix_client import MatrixClient
-from nextcloud_client import NextcloudClient
+from nextcloud_client import get_nextcloud_client
 from video_utils import patch_moviepy
 from version import __version__
 from settings_manager import get_settings_manager
-from bot_interface import BotInterface
+from bot_interface import BotInterface, describe_cron, update_nextcloud_status
 
 # Initialize Global State
 load_dotenv()
@@ -37,64 +42,72 @@ patch_moviepy()
 # Global Health Instance
 health_mgr = HealthManager()
 
-async def run_automation(matrix=None):
+# Controller log output; see _start_logging
+log = logging.getLogger("slideshow")
+_log_listener = None
+
+# Seconds between heartbeat file updates
+HEARTBEAT_INTERVAL = 60
+
+# Strong references to fire-and-forget tasks (see _spawn)
+_background_tasks = set()
+
+# Emoji prefixes stripped from progress messages before they are shown in !status
+_STATUS_EMOJI_RE = re.compile("(?:✅|💾|☁️) ")
+
+async def run_automation(matrix, config_getter=get_config, manual=False):
     """
     High-level automation workflow called by the scheduler or manual trigger.
+
+    Progress updates are collected and sent to ntfy as a single summary
+    when the run finishes, rather than one notification per stage.
+
+    Args:
+        matrix (MatrixClient): Client used for notifications, owned by the caller.
+        config_getter (callable, optional): Returns the Config to use for this run.
+                                            Defaults to the shared `get_config`.
+        manual (bool, optional): True for a `!rebuild`, which also sends a
+                                 "Rebuild Started" ntfy. Defaults to False.
     """
-    config = Config()
+    config = config_getter()
     health_mgr.config = config # Sync config for ntfy
+    matrix_on = matrix.is_configured()
     
     # Check if a job is already running
     if health_mgr.current_stage is not None:
         msg = "⚠️ A video production job is already in progress. Please try again later."
-        print(f"ABORT: {msg}")
+        log.warning(f"ABORT: {msg}")
         
-        if matrix and matrix.is_configured():
+        if matrix_on:
             await matrix.send_message(msg)
             
-        asyncio.create_task(asyncio.to_thread(
-            health_mgr.send_ntfy, 
+        health_mgr.queue_ntfy(
             msg, 
             title="Production Skipped",
             priority="default",
             tags=["warning", "stopwatch"]
-        ))
+        )
         return
     
-    # Initialize Matrix if not provided
-    created_matrix = False
-    if not matrix:
-        matrix = MatrixClient(
-            config.matrix_homeserver, 
-            config.matrix_token, 
-            config.matrix_room, 
-            config.matrix_user_id
-        )
-        created_matrix = True
-
     client = None
     temp_output_file = None
+    run_log = [] # Stage updates, sent to ntfy as one summary at the end
 
     try:
-        print("Starting scheduled slideshow automation...")
-        # Background the initial ntfy to avoid blocking
-        asyncio.create_task(asyncio.to_thread(
-            health_mgr.send_ntfy, 
-            "Starting slideshow production...", 
-            title="Rebuild Started", 
-            priority="low", 
-            tags=["rocket", "running"]
-        ))
+        log.info("Starting scheduled slideshow automation...")
+        if manual:
+            # Queue the initial ntfy to avoid blocking
+            health_mgr.queue_ntfy(
+                "Starting slideshow production...", 
+                title="Rebuild Started", 
+                priority="low", 
+                tags=["rocket", "running"]
+            )
 
         # 1. Setup Clients
         health_mgr.update_status("Starting", "Setting up Nextcloud client")
-        if config.nc_url and config.nc_user:
-            client = NextcloudClient(
-                config.nc_url, 
-                config.nc_user, 
-                config.nc_pass, 
-                verify_ssl=not config.nc_insecure
-            )
+        if config.nc_creds:
+            client = get_nextcloud_client(config.nc_creds)
 
         health_mgr.update_status("Starting", "Checking output paths")
         output_path = config.output_filepath
@@ -110,248 +123,301 @@ async def run_automation(matrix=None):
         engine = VideoEngine(config, client, health_mgr=health_mgr)
         
         async def status_reporter(msg, stage):
-            """Internal helper to notify Matrix and ntfy for each major step."""
+            """Internal helper to notify Matrix and log each major step for ntfy."""
             # Update health manager for !status command
-            health_mgr.update_status(stage, msg.replace('✅ ', '').replace('💾 ', '').replace('☁️ ', ''))
+            health_mgr.update_status(stage, _STATUS_EMOJI_RE.sub('', msg))
             
-            if matrix.is_configured():
+            if matrix_on:
                 await matrix.send_message(msg)
-            # Use specific tags for ntfy updates
-            await asyncio.to_thread(health_mgr.send_ntfy, msg, title=f"Update: {stage}", tags=["information_source"])
+            run_log.append(msg)
 
         # Validate resources before starting heavy processing
         await engine.validate_resources()
 
-        included_slides = await engine.create_slideshow(output_path, status_callback=status_reporter)
+        # A manual rebuild always re-encodes, even if nothing has changed
+        included_slides = await engine.create_slideshow(output_path, status_callback=status_reporter, force=manual)
         
         # 3. Final Success Reporting (Summary)
         health_mgr.mark_success()
         
-        if matrix.is_configured():
-            video_name = config.nextcloud_upload_path or os.path.basename(output_path)
-            # send_success already includes the slide list, so it's a good final summary
-            await matrix.send_success(video_name, included_slides)
-            
-        await asyncio.to_thread(
-            health_mgr.send_ntfy,
-            f"Slideshow production flow complete. {len(included_slides)} slides processed.",
+        # Queue ntfy first so its worker posts while the Matrix summary is sent
+        run_log.append(f"Slideshow production flow complete. {len(included_slides)} slides processed.")
+        health_mgr.queue_ntfy(
+            "\n".join(run_log),
             title="Production Complete",
             tags=["trophy"]
         )
 
+        if matrix_on:
+            video_name = config.nextcloud_upload_path or os.path.basename(output_path)
+            # send_success already includes the slide list, so it's a good final summary
+            await matrix.send_success(video_name, included_slides)
+
     except Exception as e:
         health_mgr.update_status(None) # Clear active status on error
         error_msg = str(e)
-        trace_str = traceback.format_exc()
-        print(f"ERROR: {error_msg}\\n{trace_str}")
+        log.exception(f"ERROR: {error_msg}")
         
-        if matrix.is_configured():
-            await matrix.send_failure(error_msg, trace_str)
-        
-        await asyncio.to_thread(
-            health_mgr.send_ntfy,
-            f"Slideshow production failed: {error_msg}",
+        run_log.append(f"Slideshow production failed: {error_msg}")
+        health_mgr.queue_ntfy(
+            "\n".join(run_log),
             title="Slideshow Failed",
             priority="high",
             tags=["x", "boom"]
         )
+
+        if matrix_on:
+            await matrix.send_failure(error_msg, traceback.format_exc())
     finally:
-        if created_matrix and matrix:
-            await matrix.close()
-        if temp_output_file and os.path.exists(temp_output_file):
-            os.remove(temp_output_file)
+        if temp_output_file:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(temp_output_file)
 
 
-def get_apscheduler_trigger(cron_str):
+def _start_logging():
     """
-    Creates an APScheduler CronTrigger from a standard crontab string.
-    
-    Translates the 5th field (weekday) from crontab standard (0,7=Sun, 1=Mon, ..., 6=Sat)
-    to APScheduler standard (0=Mon, 1=Tue, ..., 6=Sun).
+    Routes this module's log output through a queue drained by a background thread.
+
+    Logging calls on the event loop then only enqueue the record; the
+    blocking write to stdout happens on the listener thread.
     """
-    parts = cron_str.split()
-    if len(parts) >= 5:
-        weekday = parts[4]
-        
-        # Mapping: Crontab (0-7, 0/7=Sun) -> APScheduler (0-6, 0=Mon, 6=Sun)
-        # Translation table: 
-        # 1 -> 0 (Mon)
-        # 2 -> 1 (Tue)
-        # 3 -> 2 (Wed)
-        # 4 -> 3 (Thu)
-        # 5 -> 4 (Fri)
-        # 6 -> 5 (Sat)
-        # 0, 7 -> 6 (Sun)
-        
-        mapping = {
-            "1": "0", "2": "1", "3": "2", "4": "3", "5": "4", "6": "5", "0": "6", "7": "6",
-            "MON": "0", "TUE": "1", "WED": "2", "THU": "3", "FRI": "4", "SAT": "5", "SUN": "6"
-        }
-        
-        if weekday.upper() in mapping:
-            parts[4] = mapping[weekday.upper()]
-        elif "-" in weekday:
-            # Handle simple ranges like 1-5
-            r_parts = weekday.split("-")
-            if len(r_parts) == 2 and r_parts[0] in mapping and r_parts[1] in mapping:
-                parts[4] = f"{mapping[r_parts[0].upper()]}-{mapping[r_parts[1].upper()]}"
-        
-        resolved_cron = " ".join(parts)
-        return CronTrigger.from_crontab(resolved_cron)
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s")) # Same output as print()
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+def _stop_logging():
+    """Flushes any queued log records and stops the listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def _spawn(coro):
+    """
+    Runs a coroutine as a background task, keeping a reference until it finishes.
+
+    The event loop only holds weak references to tasks, so fire-and-forget
+    tasks must be anchored somewhere or they can be garbage collected mid-run.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def _kickoff_automation(matrix):
+    """
+    Scheduler job target: starts a production run and returns immediately.
+
+    Overlapping runs are still rejected by the in-progress check at the
+    top of `run_automation`.
+    """
+    _spawn(run_automation(matrix))
+
+
+async def _cmd_rebuild(matrix, command, scheduler=None):
+    """Handles !rebuild: starts a manual production run."""
+    await matrix.send_message("🚀 Starting manual rebuild...")
+    _spawn(run_automation(matrix, manual=True))
+
+
+async def _cmd_status(matrix, command, scheduler=None):
+    """Handles !status: reports health metrics and any active job."""
+    config = get_config()
+    if config.nc_creds:
+        await update_nextcloud_status(config.nc_creds)
+    stats = health_mgr.get_status_summary()
+    plain, html = BotInterface.format_status(stats, config)
+    await matrix.send_message(plain, html_message=html)
+
+
+async def _cmd_set(matrix, command, scheduler=None):
+    """Handles !set KEY VALUE: stores a runtime override."""
+    # Parse: !set KEY VALUE
+    key, _, value = command.removeprefix("!set ").strip().partition(" ")
+    key = key.upper()
+    value = value.strip()
+    if not key or not value:
+        await matrix.send_message("❌ Usage: !set KEY VALUE\nExample: !set IMAGE_DURATION 15")
+        return
+    
+    if key not in CONFIGURABLE_SETTINGS:
+        await matrix.send_message(
+            f"❌ '{key}' is not a configurable setting.\n"
+            f"Use !get all to see available settings."
+        )
+        return
+    
+    # Reject an invalid schedule before it is stored
+    if key == "CRON_SCHEDULE":
+        try:
+            get_apscheduler_trigger(value)
+        except ValueError as e:
+            await matrix.send_message(f"❌ Invalid CRON_SCHEDULE '{value}': {e}")
+            return
     
-    return CronTrigger.from_crontab(cron_str)
+    settings = get_settings_manager()
+    settings.set(key, value)
+    config = get_config(force_reload=True)
+    
+    # Immediate Rescheduling for Cron
+    reschedule_msg = ""
+    if key == "CRON_SCHEDULE" and scheduler:
+        try:
+            trigger = config.cron_trigger
+            scheduler.reschedule_job("slideshow_job", trigger=trigger, misfire_grace_time=3600)
+            
+            # Log and inform user about next fire time
+            job = scheduler.get_job("slideshow_job")
+            next_fire = getattr(job, 'next_run_time', "Unknown")
+            log.info(f"Schedule updated! Next run at: {next_fire}")
+            reschedule_msg = f"\n🚀 Schedule updated! Next run at: {next_fire} (applied immediately)"
+        except Exception as e:
+            reschedule_msg = f"\n❌ Failed to reschedule: {e}"
 
+    await matrix.send_message(f"✅ Set {key} = {value}{reschedule_msg}")
 
-async def handle_matrix_message(matrix, room, event, scheduler=None):
-    """Callback for handling Matrix commands."""
-    command = event.body.strip()
-    print(f"Processing command: '{command}' from {event.sender}")
+
+async def _cmd_get_all(matrix, command, scheduler=None):
+    """Handles !get all: shows all configurable settings grouped by category."""
+    plain, html = BotInterface.format_full_config(get_config())
+    await matrix.send_message(plain, html_message=html)
+
+
+async def _cmd_get(matrix, command, scheduler=None):
+    """Handles !get KEY: shows the effective value of a single setting."""
+    # Parse: !get KEY
+    key = command.removeprefix("!get ").strip().upper()
+    if not key:
+        await matrix.send_message("❌ Usage: !get KEY\nExample: !get IMAGE_DURATION")
+        return
     
-    config = Config()
-    ui = BotInterface()
+    if key not in CONFIGURABLE_SETTINGS:
+        await matrix.send_message(f"❌ '{key}' is not a configurable setting.")
+        return
     
-    if command == "!rebuild":
-        await matrix.send_message("🚀 Starting manual rebuild...")
-        asyncio.create_task(run_automation(matrix))
-        
-    elif command == "!status":
-        stats = health_mgr.get_status_summary()
-        plain, html = ui.format_status(stats, config)
-        await matrix.send_message(plain, html_message=html)
+    # Get the actual value being used
+    value = getattr(get_config(), key.lower(), "Not set")
     
-    elif command.startswith("!set "):
-        # Parse: !set KEY VALUE
-        parts = command.split(None, 2)
-        if len(parts) < 3:
-            await matrix.send_message("❌ Usage: !set KEY VALUE\nExample: !set IMAGE_DURATION 15")
-            return
-        
-        key = parts[1].upper()
-        value = parts[2]
-        
-        if key not in config.CONFIGURABLE_SETTINGS:
-            await matrix.send_message(
-                f"❌ '{key}' is not a configurable setting.\n"
-                f"Use !get all to see available settings."
-            )
-            return
-        
-        settings = get_settings_manager()
-        settings.set(key, value)
-        
-        # Immediate Rescheduling for Cron
-        reschedule_msg = ""
-        if key == "CRON_SCHEDULE" and scheduler:
-            try:
-                trigger = get_apscheduler_trigger(value)
-                scheduler.reschedule_job("slideshow_job", trigger=trigger, misfire_grace_time=3600)
-                
-                # Log and inform user about next fire time
-                job = scheduler.get_job("slideshow_job")
-                next_fire = getattr(job, 'next_run_time', "Unknown")
-                print(f"Schedule updated! Next run at: {next_fire}")
-                reschedule_msg = f"\n🚀 Schedule updated! Next run at: {next_fire} (applied immediately)"
-            except Exception as e:
-                reschedule_msg = f"\n❌ Failed to reschedule: {e}"
-
-        await matrix.send_message(f"✅ Set {key} = {value}{reschedule_msg}")
+    if key == "CRON_SCHEDULE" and value != "Not set":
+        value = describe_cron(value)
     
-    elif command == "!get all":
-        # Show all configurable settings grouped by category
-        plain, html = ui.format_full_config(config)
-        await matrix.send_message(plain, html_message=html)
-
-    elif command.startswith("!get "):
-        # Parse: !get KEY
-        parts = command.split(None, 1)
-        if len(parts) < 2:
-            await matrix.send_message("❌ Usage: !get KEY\nExample: !get IMAGE_DURATION")
-            return
-        
-        key = parts[1].upper()
-        
-        if key not in config.CONFIGURABLE_SETTINGS:
-            await matrix.send_message(f"❌ '{key}' is not a configurable setting.")
-            return
-        
-        # Get the actual value being used
-        value = getattr(config, key.lower(), "Not set")
-        
-        if key.upper() == "CRON_SCHEDULE" and value != "Not set":
-            try:
-                import cron_descriptor
-                import croniter
-                from datetime import datetime
-                
-                desc = cron_descriptor.get_description(value)
-                
-                # Calculate next run time
-                now = datetime.now()
-                iter = croniter.croniter(value, now)
-                next_run = iter.get_next(datetime)
-                
-                # Format as Next Run: YYYY-MM-DD HH:MM:SS
-                time_str = next_run.strftime('%Y-%m-%d %H:%M:%S')
-                
-                value = f"{value} ({desc}) [Next Run: {time_str}]"
-            except Exception as e:
-                print(f"Error parsing cron for display: {e}")
-                pass
-        
-        settings = get_settings_manager()
-        db_value = settings.get(key)
-        
-        if db_value is not None:
-            msg = f"📝 {key} = {value}\n(Runtime override active)"
-        else:
-            msg = f"📝 {key} = {value}\n(Using .env default)"
-        
-        await matrix.send_message(msg)
+    settings = get_settings_manager()
+    db_value = settings.get(key)
     
-    elif command == "!config":
-        # List all current configuration overrides
-        settings = get_settings_manager()
-        overrides = settings.list_all()
-        
-        if not overrides:
-            msg = "📋 Current Configuration\n\nNo runtime overrides active.\nAll settings are using .env defaults.\n\nUse !set KEY VALUE to override a setting."
-        else:
-            override_list = "\n".join([f"• {k} = {v}" for k, v in overrides.items()])
-            msg = f"📋 Current Configuration Overrides\n\n{override_list}\n\nUse !defaults to reset all to .env values."
-        
-        await matrix.send_message(msg)
+    if db_value is not None:
+        msg = f"📝 {key} = {value}\n(Runtime override active)"
+    else:
+        msg = f"📝 {key} = {value}\n(Using .env default)"
     
-    elif command == "!defaults":
-        # Reset all settings to .env defaults
-        settings = get_settings_manager()
-        count = settings.reset_all()
-        original_message = (
-            f"♻️ Reset {count} configuration override(s).\n"
-            f"All settings now use .env defaults."
-        )
-        
-        # Reset cron if needed
-        if scheduler:
-            try:
-                trigger = get_apscheduler_trigger(config.cron_schedule)
-                scheduler.reschedule_job("slideshow_job", trigger=trigger, misfire_grace_time=3600)
-                
-                job = scheduler.get_job("slideshow_job")
-                next_fire = getattr(job, 'next_run_time', "Unknown")
-                original_message += f"\n🚀 Schedule reset! Next run at: {next_fire} (applied immediately)"
-            except Exception:
-                pass
-
-        await matrix.send_message(original_message)
-        
-    elif command == "!help":
-        plain, html = ui.format_help(config)
-        await matrix.send_message(plain, html_message=html)
+    await matrix.send_message(msg)
+
+
+async def _cmd_config(matrix, command, scheduler=None):
+    """Handles !config: lists all current configuration overrides."""
+    settings = get_settings_manager()
+    overrides = settings.list_all()
+    
+    if not overrides:
+        msg = "📋 Current Configuration\n\nNo runtime overrides active.\nAll settings are using .env defaults.\n\nUse !set KEY VALUE to override a setting."
+    else:
+        override_list = "\n".join([f"• {k} = {v}" for k, v in overrides.items()])
+        msg = f"📋 Current Configuration Overrides\n\n{override_list}\n\nUse !defaults to reset all to .env values."
+    
+    await matrix.send_message(msg)
+
+
+async def _cmd_defaults(matrix, command, scheduler=None):
+    """Handles !defaults: resets all settings to .env defaults."""
+    settings = get_settings_manager()
+    count = settings.reset_all()
+    config = get_config(force_reload=True)
+    original_message = (
+        f"♻️ Reset {count} configuration override(s).\n"
+        f"All settings now use .env defaults."
+    )
+    
+    # Reset cron if needed
+    if scheduler:
+        try:
+            trigger = config.cron_trigger
+            scheduler.reschedule_job("slideshow_job", trigger=trigger, misfire_grace_time=3600)
+            
+            job = scheduler.get_job("slideshow_job")
+            next_fire = getattr(job, 'next_run_time', "Unknown")
+            original_message += f"\n🚀 Schedule reset! Next run at: {next_fire} (applied immediately)"
+        except Exception:
+            pass
+
+    await matrix.send_message(original_message)
+
+
+async def _cmd_help(matrix, command, scheduler=None):
+    """Handles !help: sends the pre-rendered help message."""
+    plain, html = BotInterface.format_help()
+    await matrix.send_message(plain, html_message=html)
+
+
+# Commands matched exactly, dispatched with a single dict lookup
+_EXACT_COMMANDS = {
+    "!rebuild": _cmd_rebuild,
+    "!status": _cmd_status,
+    "!get all": _cmd_get_all,
+    "!config": _cmd_config,
+    "!defaults": _cmd_defaults,
+    "!help": _cmd_help,
+}
+
+# Commands that take arguments, matched by prefix if no exact match is found
+_PREFIX_COMMANDS = (
+    ("!set ", _cmd_set),
+    ("!get ", _cmd_get),
+)
+
+
+async def handle_matrix_message(matrix, room, event, scheduler=None):
+    """Callback for handling Matrix commands."""
+    command = event.body.strip()
+    if not command.startswith("!"):
+        return # Ordinary chat, not a bot command
+    log.info(f"Processing command: '{command}' from {event.sender}")
+    
+    handler = _EXACT_COMMANDS.get(command)
+    if handler is None:
+        handler = next((h for prefix, h in _PREFIX_COMMANDS if command.startswith(prefix)), None)
+    
+    if handler:
+        await handler(matrix, command, scheduler=scheduler)
+
+
+async def _heartbeat_loop():
+    """
+    Writes the heartbeat file immediately and then once a minute.
+
+    Runs as a plain task on the event loop rather than a scheduler job.
+    """
+    while True:
+        try:
+            await health_mgr.update_heartbeat()
+        except Exception:
+            log.exception("Heartbeat update failed")
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
 
 
 async def main():
     """Main daemon loop."""
-    config = Config()
+    _start_logging()
+    config = get_config()
     health_mgr.config = config
     
     matrix = MatrixClient(
@@ -361,16 +427,16 @@ async def main():
         config.matrix_user_id
     )
     
-    print(f"Starting Matrix bot daemon with schedule: {config.cron_schedule}")
+    log.info(f"Starting Matrix bot daemon with schedule: {config.cron_schedule}")
     
     scheduler = AsyncIOScheduler()
     scheduler.start()
     
     # Schedule Video Production
     try:
-        trigger = get_apscheduler_trigger(config.cron_schedule)
+        trigger = config.cron_trigger
         scheduler.add_job(
-            run_automation, 
+            _kickoff_automation, 
             trigger, 
             args=[matrix], 
             id="slideshow_job", 
@@ -381,12 +447,12 @@ async def main():
         
         job = scheduler.get_job("slideshow_job")
         next_fire = getattr(job, 'next_run_time', "Unknown")
-        print(f"Scheduled slideshow job: {config.cron_schedule} (Next run: {next_fire})")
+        log.info(f"Scheduled slideshow job: {config.cron_schedule} (Next run: {next_fire})")
     except Exception as e:
-        print(f"Failed to schedule job '{config.cron_schedule}': {e}. Using default Friday 1AM.")
+        log.error(f"Failed to schedule job '{config.cron_schedule}': {e}. Using default Friday 1AM.")
         fallback_trigger = get_apscheduler_trigger("0 1 * * 5")
         scheduler.add_job(
-            run_automation, 
+            _kickoff_automation, 
             fallback_trigger, 
             args=[matrix], 
             id="slideshow_job", 
@@ -395,35 +461,45 @@ async def main():
             replace_existing=True
         )
 
-    # Schedule Heartbeat
+    # Start Heartbeat
+    heartbeat_task = None
     if config.enable_heartbeat:
-        print("Enabling heartbeat mechanism...")
-        scheduler.add_job(
-            health_mgr.update_heartbeat, 
-            'interval', 
-            minutes=1, 
-            id="heartbeat_job",
-            replace_existing=True
-        )
-        asyncio.create_task(health_mgr.update_heartbeat())
+        log.info("Enabling heartbeat mechanism...")
+        heartbeat_task = asyncio.create_task(_heartbeat_loop())
 
     if matrix.is_configured():
         matrix.add_message_callback(lambda room, event: handle_matrix_message(matrix, room, event, scheduler=scheduler))
         listener_task = asyncio.create_task(matrix.listen_forever())
-        print("Matrix listener active.")
+        log.info("Matrix listener active.")
     else:
-        print("Matrix not configured, running in scheduler-only mode.")
+        log.info("Matrix not configured, running in scheduler-only mode.")
         listener_task = None
 
+    # Idle until SIGINT/SIGTERM rather than waking the loop periodically
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
     try:
-        while True:
-            await asyncio.sleep(3600)
-    except (KeyboardInterrupt, SystemExit):
+        await stop_event.wait()
+        log.info("Shutdown signal received, stopping...")
+    finally:
         scheduler.shutdown()
         if matrix:
             await matrix.close()
         if listener_task:
             listener_task.cancel()
+        if heartbeat_task:
+            heartbeat_task.cancel()
+        _stop_logging()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Prefer uvloop's libuv-based event loop when it is installed
+    try:
+        import uvloop
+        loop_factory = uvloop.new_event_loop
+    except ImportError:
+        loop_factory = None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main())
@@ -33,6 +33,7 @@
             peewee
             cron-descriptor
             croniter
+            uvloop
           ]
         );
 
@@ -8,6 +8,7 @@ It also includes a `NullLogger` to silence MoviePy's verbose output.
 
 import os
 import time
+import asyncio
 import requests
 import proglog
 
@@ -72,6 +73,11 @@ class HealthManager:
         self.current_stage = None
         self.current_job_start_time = None
         self.progress = 0
+        # Outbound ntfy notifications are posted in order by a single worker
+        # task over one keep-alive HTTP session.
+        self._ntfy_queue = asyncio.Queue()
+        self._ntfy_worker = None
+        self._ntfy_session = requests.Session()
 
     def update_status(self, stage, task=None):
         """Updates the current active status/stage of the bot."""
@@ -144,6 +150,58 @@ class HealthManager:
         }
         return summary
 
+    def _ntfy_target_url(self):
+        """
+        Resolves the ntfy topic URL, or None if notifications are disabled.
+
+        The enable flag is checked first so the remaining ntfy settings are
+        only looked up when they will actually be used.
+
+        Returns:
+            str: The full topic URL, or None.
+        """
+        if not self.config or not self.config.enable_ntfy:
+            return None
+
+        ntfy_url = self.config.ntfy_url
+        ntfy_topic = self.config.ntfy_topic
+        if not ntfy_url or not ntfy_topic:
+            return None
+
+        # Ensure URL ends with / and combine with topic
+        return ntfy_url.rstrip('/') + '/' + ntfy_topic
+
+    def queue_ntfy(self, message, title=None, priority="default", tags=None):
+        """
+        Queues an ntfy notification without blocking the caller.
+
+        Must be called from the running event loop. The notification is sent
+        by a long-lived worker task, which is started on first use.
+
+        Args:
+            message (str): The body of the notification.
+            title (str, optional): The title of the notification.
+            priority (str, optional): Notification priority. Defaults to 'default'.
+            tags (list, optional): A list of tag keywords. Defaults to None.
+        """
+        # Skip the queue and worker thread entirely when ntfy is disabled
+        if not self._ntfy_target_url():
+            return
+        if self._ntfy_worker is None or self._ntfy_worker.done():
+            self._ntfy_worker = asyncio.create_task(self._run_ntfy_worker())
+        self._ntfy_queue.put_nowait((message, title, priority, tags))
+
+    async def _run_ntfy_worker(self):
+        """
+        Drains the ntfy queue, sending each notification off the event loop.
+        """
+        while True:
+            message, title, priority, tags = await self._ntfy_queue.get()
+            try:
+                await asyncio.to_thread(self.send_ntfy, message, title=title, priority=priority, tags=tags)
+            finally:
+                self._ntfy_queue.task_done()
+
     def send_ntfy(self, message, title=None, priority="default", tags=None):
         """
         Sends a notification to an ntfy.sh topic.
@@ -154,19 +212,12 @@ class HealthManager:
             priority (str, optional): Notification priority (e.g., 'high', 'low'). Defaults to 'default'.
             tags (list, optional): A list of tag keywords (e.g., ['rocket', 'boom']). Defaults to None.
         """
-        if not self.config or not self.config.enable_ntfy:
+        target_url = self._ntfy_target_url()
+        if not target_url:
             return
 
-        ntfy_url = self.config.ntfy_url
-        ntfy_topic = self.config.ntfy_topic
         ntfy_token = self.config.ntfy_token
 
-        if not ntfy_url or not ntfy_topic:
-            return
-
-        # Ensure URL ends with / and combine with topic
-        target_url = ntfy_url.rstrip('/') + '/' + ntfy_topic
-
         headers = {}
         if ntfy_token:
             headers["Authorization"] = f"Bearer {ntfy_token}"
@@ -185,7 +236,7 @@ class HealthManager:
             headers["Tags"] = ",".join(tags)
 
         try:
-            response = requests.post(target_url, data=message.encode('utf-8'), headers=headers, timeout=10)
+            response = self._ntfy_session.post(target_url, data=message.encode('utf-8'), headers=headers, timeout=10)
             response.raise_for_status()
         except Exception as e:
             print(f"ERROR: Failed to send ntfy notification to {target_url}: {e}")
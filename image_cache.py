@@ -0,0 +1,112 @@
+"""
+Persistent on-disk cache of standardized slideshow frames.
+
+Decoding and resizing every photo is the most expensive part of preparing a
+slideshow, yet the image set changes little between scheduled runs. This
+module stores each resized frame as a PNG under `CACHE_DIR`, so an unchanged
+image is only decoded and resized once. The cache lives next to the settings
+database, which persists across container restarts when mounted as a volume.
+"""
+
+import hashlib
+import os
+
+DEFAULT_MAX_MB = 1024
+
+
+def _max_mb():
+    """Reads IMAGE_CACHE_MAX_MB, falling back to the default if it isn't a valid integer."""
+    value = os.environ.get("IMAGE_CACHE_MAX_MB", str(DEFAULT_MAX_MB))
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Warning: Invalid IMAGE_CACHE_MAX_MB '{value}', using {DEFAULT_MAX_MB}")
+        return DEFAULT_MAX_MB
+
+
+# Cache location and size cap; the least recently used frames are evicted first
+CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", os.path.join(os.environ.get("DB_DIR", "/data"), "frame_cache"))
+CACHE_MAX_BYTES = _max_mb() * 1024 * 1024
+
+
+def ensure_cache_dir(cache_dir=CACHE_DIR):
+    """
+    Creates the cache directory if needed.
+
+    Args:
+        cache_dir (str, optional): The cache directory. Defaults to `CACHE_DIR`.
+
+    Returns:
+        str: The cache directory, or None if it cannot be created.
+    """
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        return cache_dir
+    except OSError as e:
+        print(f"Warning: Frame cache disabled, cannot create {cache_dir}: {e}")
+        return None
+
+
+def cached_frame_path(cache_dir, image_path, target_size):
+    """
+    Returns the cache location for an image standardized to `target_size`.
+
+    The key is a digest of the file's contents rather than its path and
+    modification time, so a frame is shared by identical images wherever they
+    come from, and survives a Nextcloud file being re-downloaded or moved
+    between folders. Hashing is much cheaper than decoding.
+
+    Args:
+        cache_dir (str): The cache directory.
+        image_path (str): The file path to the source image.
+        target_size (tuple): The (width, height) of the frame.
+
+    Returns:
+        str: The path of the cached PNG frame, which may not exist yet.
+    """
+    with open(image_path, 'rb') as f:
+        digest = hashlib.file_digest(f, "sha1").hexdigest()
+    width, height = target_size
+    return os.path.join(cache_dir, f"{digest}_{width}x{height}.png")
+
+
+def touch(frame_path):
+    """
+    Marks a cached frame as recently used.
+
+    Args:
+        frame_path (str): The path of the cached frame.
+
+    Returns:
+        bool: True if the frame exists in the cache, False otherwise.
+    """
+    try:
+        os.utime(frame_path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def prune(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """
+    Evicts the least recently used frames until the cache fits `max_bytes`.
+
+    Args:
+        cache_dir (str, optional): The cache directory. Defaults to `CACHE_DIR`.
+        max_bytes (int, optional): The size cap. Defaults to `CACHE_MAX_BYTES`.
+    """
+    try:
+        with os.scandir(cache_dir) as entries:
+            frames = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in entries if e.is_file()]
+    except FileNotFoundError:
+        return
+
+    total = sum(size for _, size, _ in frames)
+    for _, size, path in sorted(frames):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError as e:
+            print(f"Warning: Could not evict cached frame {path}: {e}")
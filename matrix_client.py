@@ -323,3 +323,11 @@ class MatrixClient:
         if self.client:
             await self.client.close()
             self.client = None
+
+    async def __aenter__(self):
+        """Allows use as `async with MatrixClient(...) as matrix:`."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Closes the connection when leaving the `async with` block."""
+        await self.close()
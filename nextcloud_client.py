@@ -6,14 +6,26 @@ instance using its WebDAV API. It supports listing, downloading, and uploading
 files, with specific handling for sorting numerically prefixed files.
 """
 
+import contextlib
+import hashlib
+import json
+import math
 import os
 import re
 import requests
+from requests.adapters import HTTPAdapter
 import xml.etree.ElementTree as ET
 import tempfile
 import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote, unquote
 
+# Persistent mirror of downloaded folders, so unchanged files aren't fetched again
+DOWNLOAD_CACHE_DIR = os.environ.get("NEXTCLOUD_CACHE_DIR", os.path.join(os.environ.get("DB_DIR", "/data"), "nextcloud_cache"))
+# Per-folder index of {filename: ETag} for the cached copies
+ETAG_INDEX = ".etags.json"
+
 def sort_key(filepath):
     """
     Generates a sort key for a filepath to sort numerically-prefixed
@@ -55,7 +67,17 @@ class NextcloudClient:
         base_url (str): The base URL of the Nextcloud instance.
         auth (tuple): A tuple containing the username and password for authentication.
         verify_ssl (bool): Whether to verify SSL certificates for requests.
+        session (requests.Session): A persistent HTTP session for connection reuse.
     """
+    # Number of files (or file parts) fetched concurrently
+    MAX_DOWNLOAD_WORKERS = 8
+    # Files at least this large are downloaded as RANGE_DOWNLOAD_PARTS concurrent byte ranges
+    RANGE_DOWNLOAD_THRESHOLD = 4 * 1024 * 1024
+    RANGE_DOWNLOAD_PARTS = 5
+    # Uploads larger than this are split into chunks of this size, sent MAX_UPLOAD_WORKERS at a time
+    UPLOAD_CHUNK_SIZE = 10 * 1024 * 1024
+    MAX_UPLOAD_WORKERS = 4
+
     def __init__(self, base_url, username, password, verify_ssl=True):
         """
         Initializes the NextcloudClient.
@@ -72,6 +94,17 @@ class NextcloudClient:
         self.base_url = base_url
         self.auth = (username, password)
         self.verify_ssl = verify_ssl
+        # Persistent session so repeated calls reuse keep-alive connections.
+        # The pool holds one connection per download worker, so concurrent
+        # downloads don't open (and then discard) extra connections.
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        self.session.verify = verify_ssl
+        adapter = HTTPAdapter(pool_maxsize=self.MAX_DOWNLOAD_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Whether the server honours Range requests; unknown until first probed
+        self._range_support = None
 
     def _get_webdav_url(self, path):
         """
@@ -90,11 +123,164 @@ class NextcloudClient:
         path_encoded = quote(path.strip('/'), safe='/')
         return f"{self.base_url}remote.php/dav/files/{user_encoded}/{path_encoded}"
 
+    def _download_jobs(self, download_url, local_filename, size=None):
+        """
+        Plans the requests needed to download one file.
+
+        Files of at least `RANGE_DOWNLOAD_THRESHOLD` bytes are split into
+        `RANGE_DOWNLOAD_PARTS` byte ranges that can be fetched concurrently,
+        since several streams fill a high-latency link better than one. The
+        local file is preallocated so each part can write at its offset.
+        Files are only split if the server supports byte ranges.
+
+        Args:
+            download_url (str): The full URL of the file to download.
+            local_filename (str): The local path to write the file to.
+            size (int, optional): The file size in bytes, if known.
+
+        Returns:
+            list: (download_url, local_filename, start, end) tuples for
+                  `_download_to`; start and end are None for a whole-file GET.
+        """
+        if not size or size < self.RANGE_DOWNLOAD_THRESHOLD or not self._supports_ranges(download_url):
+            return [(download_url, local_filename, None, None)]
+
+        with open(local_filename, 'wb') as f:
+            f.truncate(size)
+        part_size = math.ceil(size / self.RANGE_DOWNLOAD_PARTS)
+        return [
+            (download_url, local_filename, start, min(start + part_size, size) - 1)
+            for start in range(0, size, part_size)
+        ]
+
+    def _supports_ranges(self, download_url):
+        """
+        Reports whether the server honours byte-range requests, probing it once.
+
+        A server that ignores `Range` answers every part with the whole file,
+        so support is checked with a one-byte request before any file is split.
+
+        Args:
+            download_url (str): The full URL of a file to probe with.
+
+        Returns:
+            bool: True if ranged downloads can be used.
+        """
+        if self._range_support is None:
+            try:
+                # The body isn't read, so a 200 costs no more than its headers
+                with self.session.get(download_url, headers={'Range': 'bytes=0-0'}, stream=True) as response:
+                    if not response.ok:
+                        return False # Inconclusive; probe again with the next file
+                    self._range_support = response.status_code == 206
+            except requests.exceptions.RequestException:
+                return False
+        return self._range_support
+
+    def _download_to(self, download_url, local_filename, start=None, end=None):
+        """
+        Streams a remote file, or one byte range of it, to a local path.
+
+        Args:
+            download_url (str): The full URL of the file to download.
+            local_filename (str): The local path to write the file to.
+            start (int, optional): First byte of the range to fetch. The file
+                                   must already be preallocated when set.
+            end (int, optional): Last byte (inclusive) of the range to fetch.
+
+        Returns:
+            str: The local path the file was written to.
+
+        Raises:
+            requests.exceptions.RequestException: If the download fails.
+        """
+        headers = {'Range': f"bytes={start}-{end}"} if start is not None else None
+        with self.session.get(download_url, headers=headers, stream=True) as download_response:
+            download_response.raise_for_status()
+
+            if start is None:
+                with open(local_filename, 'wb') as f:
+                    for chunk in download_response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                return local_filename
+
+            if download_response.status_code != 206:
+                # The server ignored the range and sent the whole file, so the
+                # first part writes all of it and the others have nothing to do
+                if start != 0:
+                    return local_filename
+            with open(local_filename, 'r+b') as f:
+                f.seek(start)
+                for chunk in download_response.iter_content(chunk_size=65536):
+                    f.write(chunk)
+        return local_filename
+
+    def _run_downloads(self, jobs):
+        """
+        Runs download jobs from `_download_jobs`, overlapping them on a thread pool.
+
+        Args:
+            jobs (list): (download_url, local_filename, start, end) tuples.
+
+        Raises:
+            requests.exceptions.RequestException: If any download fails.
+        """
+        if len(jobs) == 1:
+            self._download_to(*jobs[0])
+            return
+        # Downloads are I/O-bound, so overlap them on a small thread pool
+        workers = min(self.MAX_DOWNLOAD_WORKERS, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda job: self._download_to(*job), jobs))
+
+    def _cache_folder(self, remote_path, allowed_extensions):
+        """
+        Returns the persistent download cache directory for a remote folder listing.
+
+        Args:
+            remote_path (str): The remote folder being mirrored.
+            allowed_extensions (tuple): The extension filter applied to the listing.
+
+        Returns:
+            str: The cache directory, or None if it cannot be created.
+        """
+        key = "|".join([self.base_url, self.auth[0], remote_path.strip('/'), *(allowed_extensions or ())])
+        folder = os.path.join(DOWNLOAD_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest())
+        try:
+            os.makedirs(folder, exist_ok=True)
+            return folder
+        except OSError as e:
+            print(f"Warning: Download cache disabled, cannot create {folder}: {e}")
+            return None
+
+    @staticmethod
+    def _load_etags(cache_dir):
+        """Internal helper to read a cache folder's {filename: etag} index."""
+        try:
+            with open(os.path.join(cache_dir, ETAG_INDEX), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_etags(cache_dir, etags):
+        """Internal helper to atomically replace a cache folder's {filename: etag} index."""
+        index_path = os.path.join(cache_dir, ETAG_INDEX)
+        with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(etags, f)
+        os.replace(index_path + ".tmp", index_path)
+
     def list_and_download_files(self, remote_path, allowed_extensions=None):
         """
-        Lists files in a Nextcloud folder, downloads them to a temporary
+        Lists files in a Nextcloud folder, downloads them to a local
         directory, and returns the sorted list of local paths.
 
+        Files are mirrored into a persistent cache directory under
+        `DOWNLOAD_CACHE_DIR`, and a file whose ETag in the listing is unchanged
+        since the last run is not downloaded again. Files no longer on the
+        server are removed from the mirror. If the cache is unavailable, files
+        are downloaded to a new temporary directory instead.
+
         Files are sorted using the `sort_key` function, which prioritizes
         numerically prefixed filenames.
 
@@ -107,17 +293,23 @@ class NextcloudClient:
         Returns:
             tuple: A tuple containing:
                    - list: A sorted list of local file paths of downloaded images.
-                   - str: The path to the temporary directory where files were downloaded.
+                   - str: The temporary directory the files were downloaded to, which
+                          the caller should remove, or None if they are in the cache.
                    Returns (None, None) if an error occurs.
         """
         propfind_url = self._get_webdav_url(remote_path)
-        temp_dir = tempfile.mkdtemp()
+        cache_dir = self._cache_folder(remote_path, allowed_extensions)
+        download_dir = cache_dir or tempfile.mkdtemp()
+        cached_etags = self._load_etags(cache_dir) if cache_dir else {}
+        listed_etags = {}
+        reused = set()
         downloaded_image_paths = []
+        jobs = [] # See _download_jobs
 
         try:
             # Use PROPFIND to get directory contents
             headers = {'Depth': '1'}
-            response = requests.request('PROPFIND', propfind_url, auth=self.auth, headers=headers, verify=self.verify_ssl)
+            response = self.session.request('PROPFIND', propfind_url, headers=headers)
             response.raise_for_status() # Raise an exception for HTTP errors
 
             root = ET.fromstring(response.content)
@@ -145,29 +337,56 @@ class NextcloudClient:
                 download_url = f"{self.base_url}{file_href.lstrip('/')}"
                 # Decode the filename (e.g., %20 -> space) for local storage and reporting
                 filename_unquoted = unquote(os.path.basename(file_href))
-                local_filename = os.path.join(temp_dir, filename_unquoted)
+                local_filename = os.path.join(download_dir, filename_unquoted)
+                downloaded_image_paths.append(local_filename)
 
-                print(f"Downloading {file_href} to {local_filename}...")
-                download_response = requests.get(download_url, auth=self.auth, verify=self.verify_ssl, stream=True)
-                download_response.raise_for_status()
+                # Skip files whose ETag matches the copy already in the cache
+                etag_elem = response_elem.find('d:propstat/d:prop/d:getetag', ns)
+                etag = etag_elem.text if etag_elem is not None else None
+                if etag:
+                    listed_etags[filename_unquoted] = etag
+                    if cached_etags.get(filename_unquoted) == etag and os.path.exists(local_filename):
+                        reused.add(filename_unquoted)
+                        continue
 
-                # Save the downloaded file
-                with open(local_filename, 'wb') as f:
-                    for chunk in download_response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                downloaded_image_paths.append(local_filename)
+                # The listing reports each file's size, which decides whether to split it
+                size_elem = response_elem.find('d:propstat/d:prop/d:getcontentlength', ns)
+                size = int(size_elem.text) if size_elem is not None and size_elem.text else None
+
+                print(f"Downloading {file_href} to {local_filename}...")
+                jobs.extend(self._download_jobs(download_url, local_filename, size))
+
+            if cache_dir:
+                if reused:
+                    print(f"Reusing {len(reused)} unchanged file(s) from the download cache.")
+                # Drop index entries for files about to be rewritten, so an
+                # interrupted download is never mistaken for a cached copy
+                self._save_etags(cache_dir, {name: listed_etags[name] for name in reused})
+                listed_names = {os.path.basename(p) for p in downloaded_image_paths}
+                with os.scandir(cache_dir) as entries:
+                    for entry in entries:
+                        if entry.name != ETAG_INDEX and entry.name not in listed_names:
+                            os.unlink(entry.path)
+
+            if jobs:
+                self._run_downloads(jobs)
+
+            if cache_dir:
+                self._save_etags(cache_dir, listed_etags)
 
         except requests.exceptions.RequestException as e:
             print(f"Error connecting to Nextcloud or during file operation: {e}")
-            shutil.rmtree(temp_dir) # Clean up temp directory on error
+            if not cache_dir:
+                shutil.rmtree(download_dir) # Clean up temp directory on error
             return None, None
         except ET.ParseError as e:
             print(f"Error parsing Nextcloud response: {e}")
-            shutil.rmtree(temp_dir) # Clean up temp directory on error
+            if not cache_dir:
+                shutil.rmtree(download_dir) # Clean up temp directory on error
             return None, None
 
         downloaded_image_paths.sort(key=sort_key)
-        return downloaded_image_paths, temp_dir
+        return downloaded_image_paths, None if cache_dir else download_dir
 
     def download_file(self, remote_path):
         """
@@ -190,23 +409,72 @@ class NextcloudClient:
 
         print(f"Downloading {remote_path} from Nextcloud to {local_filename}...")
         try:
-            download_response = requests.get(download_url, auth=self.auth, verify=self.verify_ssl, stream=True)
-            download_response.raise_for_status()
-
-            with open(local_filename, 'wb') as f:
-                for chunk in download_response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
+            # Append videos are often large, so find the size up front to allow a split download
+            head_response = self.session.head(download_url)
+            size = int(head_response.headers.get('Content-Length', 0)) if head_response.ok else None
+            self._run_downloads(self._download_jobs(download_url, local_filename, size))
             return local_filename, temp_dir
         except requests.exceptions.RequestException as e:
             print(f"Error downloading file from Nextcloud: {e}")
             shutil.rmtree(temp_dir)
             return None, None
 
+    def _upload_chunked(self, local_filepath, upload_url, size):
+        """
+        Uploads a large file with Nextcloud's chunked upload protocol (v2).
+
+        The file is sent in `UPLOAD_CHUNK_SIZE` pieces, `MAX_UPLOAD_WORKERS` at a
+        time, to a temporary transfer folder, and Nextcloud then assembles it
+        at `upload_url` on the final MOVE.
+
+        Args:
+            local_filepath (str): The local path to the file to upload.
+            upload_url (str): The full WebDAV URL of the destination.
+            size (int): The size of the file in bytes.
+
+        Returns:
+            bool: True once uploaded, or False if the server doesn't support chunked uploads.
+
+        Raises:
+            requests.exceptions.RequestException: If a chunk or the final assembly fails.
+        """
+        transfer_url = f"{self.base_url}remote.php/dav/uploads/{quote(self.auth[0])}/slideshow-{uuid.uuid4().hex}"
+        headers = {'Destination': upload_url}
+        response = self.session.request('MKCOL', transfer_url, headers=headers)
+        if response.status_code != 201:
+            return False
+
+        def put_chunk(index):
+            with open(local_filepath, 'rb') as f:
+                f.seek(index * self.UPLOAD_CHUNK_SIZE)
+                data = f.read(self.UPLOAD_CHUNK_SIZE)
+            # Chunks are numbered from 1; fixed-width names keep them in order
+            chunk_response = self.session.put(f"{transfer_url}/{index + 1:05d}", data=data, headers=headers)
+            chunk_response.raise_for_status()
+
+        try:
+            num_chunks = math.ceil(size / self.UPLOAD_CHUNK_SIZE)
+            with ThreadPoolExecutor(max_workers=min(self.MAX_UPLOAD_WORKERS, num_chunks)) as executor:
+                list(executor.map(put_chunk, range(num_chunks)))
+            response = self.session.request(
+                'MOVE', f"{transfer_url}/.file", headers={**headers, 'OC-Total-Length': str(size)}
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            # Discard the partial transfer; the error itself is reported by upload_file
+            with contextlib.suppress(requests.exceptions.RequestException):
+                self.session.delete(transfer_url)
+            raise
+        return True
+
     def upload_file(self, local_filepath, remote_path):
         """
         Uploads a local file to a specified path on Nextcloud.
 
+        Files larger than `UPLOAD_CHUNK_SIZE` are sent as concurrent chunks
+        when the server supports it; otherwise the file is streamed from disk
+        in a single PUT.
+
         Args:
             local_filepath (str): The local path to the file to upload.
             remote_path (str): The destination path on Nextcloud (e.g., "Videos/uploaded_video.mp4").
@@ -217,9 +485,11 @@ class NextcloudClient:
         upload_url = self._get_webdav_url(remote_path)
         print(f"Uploading video to Nextcloud: {remote_path}...")
         try:
-            with open(local_filepath, 'rb') as video_file:
-                response = requests.put(upload_url, data=video_file, auth=self.auth, verify=self.verify_ssl)
-                response.raise_for_status() # Raise an exception for HTTP errors
+            size = os.path.getsize(local_filepath)
+            if size <= self.UPLOAD_CHUNK_SIZE or not self._upload_chunked(local_filepath, upload_url, size):
+                with open(local_filepath, 'rb') as video_file:
+                    response = self.session.put(upload_url, data=video_file)
+                    response.raise_for_status() # Raise an exception for HTTP errors
             print(f"Video uploaded successfully to Nextcloud: {upload_url}")
         except requests.exceptions.RequestException as e:
             print(f"Error uploading video to Nextcloud: {e}")
@@ -239,7 +509,71 @@ class NextcloudClient:
         try:
             # Depth 0 checks only the specified path itself
             headers = {'Depth': '0'}
-            response = requests.request('PROPFIND', url, auth=self.auth, headers=headers, verify=self.verify_ssl)
+            response = self.session.request('PROPFIND', url, headers=headers)
             return response.status_code in (200, 207)
         except requests.exceptions.RequestException:
             return False
+
+    def get_etag(self, path):
+        """
+        Retrieves the ETag of a file on Nextcloud.
+
+        Args:
+            path (str): The path of the file on Nextcloud.
+
+        Returns:
+            str: The ETag, or None if the file or its ETag cannot be retrieved.
+        """
+        url = self._get_webdav_url(path)
+        try:
+            response = self.session.request('PROPFIND', url, headers={'Depth': '0'})
+            response.raise_for_status()
+            etag_elem = ET.fromstring(response.content).find('.//{DAV:}getetag')
+            return etag_elem.text if etag_elem is not None else None
+        except (requests.exceptions.RequestException, ET.ParseError):
+            return None
+
+    def ping(self, timeout=2.0):
+        """
+        Performs a lightweight reachability check against the server.
+
+        Sends a single HEAD request to Nextcloud's `status.php` endpoint,
+        which is cheap to serve and needs no WebDAV round-trip.
+
+        Args:
+            timeout (float, optional): Request timeout in seconds. Defaults to 2.0.
+
+        Returns:
+            bool: True if the server responded successfully, False otherwise.
+        """
+        try:
+            response = self.session.head(f"{self.base_url}status.php", timeout=timeout)
+            return response.ok
+        except requests.exceptions.RequestException:
+            return False
+
+
+# Shared client, reused across automation runs and status checks
+_client = None
+_client_creds = None
+
+
+def get_nextcloud_client(creds):
+    """
+    Returns the shared NextcloudClient, rebuilding it if the credentials change.
+
+    Reusing one client keeps its HTTP session (and TLS connections) alive
+    between runs instead of paying a fresh handshake each time.
+
+    Args:
+        creds (tuple): (url, username, password, verify_ssl), as in `Config.nc_creds`.
+
+    Returns:
+        NextcloudClient: The shared client instance.
+    """
+    global _client, _client_creds
+    if _client is None or _client_creds != creds:
+        url, user, password, verify_ssl = creds
+        _client = NextcloudClient(url, user, password, verify_ssl=verify_ssl)
+        _client_creds = creds
+    return _client
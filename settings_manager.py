@@ -7,12 +7,17 @@ database and persist across container restarts when mounted as a volume.
 """
 
 import os
-from peewee import SqliteDatabase, Model, CharField, TextField, DoesNotExist
+import time
+from peewee import SqliteDatabase, Model, CharField, TextField
 
 # Database configuration - hardcoded to /data for container use
 DB_DIR = os.environ.get("DB_DIR", "/data")
 DB_PATH = os.path.join(DB_DIR, "settings.db")
 
+# How long (in seconds) a looked-up value is served from memory before the
+# database is queried again. Writes through SettingsManager invalidate immediately.
+CACHE_TTL = 60
+
 # Initialize database
 db = SqliteDatabase(DB_PATH)
 
@@ -39,12 +44,18 @@ class SettingsManager:
     This class provides methods to get, set, delete, and list configuration
     settings stored in a SQLite database. It handles database initialization
     and provides a clean interface for runtime configuration management.
+
+    Lookups are served from an in-memory snapshot of the whole table, loaded
+    with a single query and refreshed after `CACHE_TTL` seconds, since a
+    single Config read touches dozens of keys; writes invalidate the snapshot.
     """
     
     def __init__(self):
         """
         Initializes the SettingsManager and ensures the database is ready.
         """
+        self._cache = None # Snapshot of all settings, or None when stale
+        self._cache_expiry = 0
         self._ensure_db()
     
     def _ensure_db(self):
@@ -69,11 +80,7 @@ class SettingsManager:
         Returns:
             str: The setting value, or the default if not found.
         """
-        try:
-            setting = Setting.get(Setting.key == key)
-            return setting.value
-        except DoesNotExist:
-            return default
+        return self._load_all().get(key, default)
     
     def set(self, key, value):
         """
@@ -87,6 +94,7 @@ class SettingsManager:
             bool: True if successful.
         """
         Setting.replace(key=key, value=str(value)).execute()
+        self.invalidate_cache()
         return True
     
     def delete(self, key):
@@ -100,6 +108,7 @@ class SettingsManager:
             bool: True if the setting was deleted, False if it didn't exist.
         """
         deleted = Setting.delete().where(Setting.key == key).execute()
+        self.invalidate_cache()
         return deleted > 0
     
     def reset_all(self):
@@ -112,6 +121,7 @@ class SettingsManager:
             int: The number of settings deleted.
         """
         count = Setting.delete().execute()
+        self.invalidate_cache()
         return count
     
     def list_all(self):
@@ -126,6 +136,25 @@ class SettingsManager:
             settings[setting.key] = setting.value
         return settings
     
+    def _load_all(self):
+        """
+        Returns the cached snapshot of all settings, reloading it if stale.
+
+        Returns:
+            dict: A dictionary of all settings (key: value pairs).
+        """
+        now = time.monotonic()
+        if self._cache is None or now >= self._cache_expiry:
+            self._cache = self.list_all()
+            self._cache_expiry = now + CACHE_TTL
+        return self._cache
+
+    def invalidate_cache(self):
+        """
+        Drops the cached snapshot so the next read goes to the database.
+        """
+        self._cache = None
+    
     def close(self):
         """
         Closes the database connection.
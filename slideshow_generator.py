@@ -9,9 +9,14 @@ video clip to be appended to the slideshow.
 
 import os
 import math
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+from PIL import Image
 from moviepy.editor import ImageClip, concatenate_videoclips, VideoFileClip, CompositeVideoClip
-from video_utils import resize_image
+import image_cache
+from video_utils import resize_image, standardize_image, run_ffmpeg
 from overlay_manager import TimerOverlay, MusicAttributionOverlay
 
 class SlideshowGenerator:
@@ -27,6 +32,9 @@ class SlideshowGenerator:
         target_size (tuple): A tuple (width, height) representing the target
                              resolution for all images and appended videos.
     """
+    # Fewer frames to resize than this are done inline; a spawned pool costs more to start
+    MIN_POOL_JOBS = 8
+
     def __init__(self, target_size=(1920, 1080)):
         """
         Initializes the SlideshowGenerator.
@@ -103,6 +111,260 @@ class SlideshowGenerator:
         
         return slideshow_video
 
+    def standardize_images(self, image_paths, work_dir):
+        """
+        Resizes images to the target size and saves them as PNG frames for ffmpeg.
+
+        Images that cannot be processed are skipped, as in `create_video`.
+        Normalising every image to one format and size also keeps ffmpeg's
+        concat demuxer happy with mixed JPEG/PNG/WebP sources. Frames are
+        reused from the persistent frame cache where possible, and only
+        written to `work_dir` if the cache is unavailable. The remaining
+        images are spread across a process pool when there are enough of them.
+
+        Args:
+            image_paths (list): Paths of the source images, in display order.
+            work_dir (str): Directory to write the standardized frames to.
+
+        Returns:
+            list: Paths of the standardized frames, in display order.
+        """
+        print(f"Standardizing {len(image_paths)} images to {self.target_size}...")
+        cache_dir = image_cache.ensure_cache_dir()
+        if cache_dir:
+            # Evict before this run, so none of its frames are removed while in use
+            image_cache.prune(cache_dir)
+
+        # Serve cache hits here, so only the misses need decoding
+        results = [None] * len(image_paths)
+        misses = []
+        for i, p in enumerate(image_paths):
+            frame_path = os.path.join(work_dir, f"{i:05d}.png")
+            if cache_dir:
+                try:
+                    frame_path = image_cache.cached_frame_path(cache_dir, p, self.target_size)
+                except OSError as e:
+                    results[i] = (None, str(e))
+                    continue
+                if image_cache.touch(frame_path):
+                    results[i] = (frame_path, None)
+                    continue
+            misses.append((i, p, frame_path))
+
+        if misses:
+            print(f"{len(image_paths) - len(misses)} frames cached, {len(misses)} to resize.")
+            jobs = [(p, self.target_size, frame_path) for _, p, frame_path in misses]
+            # Decoding and resizing is CPU-bound, so spread it across processes.
+            # "spawn" keeps workers clear of state inherited from the threaded parent,
+            # but each worker re-imports the app, so a handful of images is done inline.
+            workers = min(os.cpu_count() or 1, len(jobs))
+            if workers > 1 and len(jobs) >= self.MIN_POOL_JOBS:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    resized = list(executor.map(standardize_image, *zip(*jobs), chunksize=4))
+            else:
+                resized = [standardize_image(*job) for job in jobs]
+            for (i, _, _), result in zip(misses, resized):
+                results[i] = result
+
+        frame_paths = []
+        for p, (frame_path, error) in zip(image_paths, results):
+            if frame_path:
+                frame_paths.append(frame_path)
+            else:
+                print(f"Warning: Could not process image {p}: {error}")
+        return frame_paths
+
+    def render_attribution_overlays(self, attributions, work_dir, video_duration, display_duration=15):
+        """
+        Renders music attribution overlays to images for `write_video_ffmpeg`.
+
+        Each overlay uses the same layout as `apply_music_attributions`, but is
+        drawn once to an RGBA PNG that ffmpeg composites onto the video itself.
+
+        Args:
+            attributions (list): List of (start_time, metadata_text) tuples.
+            work_dir (str): Directory to write the overlay images to.
+            video_duration (float): The total duration of the video.
+            display_duration (int): How long each attribution should be shown.
+
+        Returns:
+            list: (image_path, (x, y), start_time, end_time) tuples.
+        """
+        attr_overlay = MusicAttributionOverlay(target_size=self.target_size)
+        overlays = []
+
+        for i, (start_time, metadata) in enumerate(attributions):
+            # Ensure it doesn't exceed the video duration
+            duration = min(display_duration, video_duration - start_time)
+            if duration <= 0:
+                continue
+
+            clip = attr_overlay.create_attribution_clip(attribution_text=metadata, duration=duration)
+            alpha = clip.mask.get_frame(0) * 255 if clip.mask else np.full(clip.size[::-1], 255)
+            rgba = np.dstack([clip.get_frame(0), alpha]).astype('uint8')
+
+            image_path = os.path.join(work_dir, f"attribution_{i:03d}.png")
+            Image.fromarray(rgba, 'RGBA').save(image_path)
+            overlays.append((image_path, clip.pos(0), start_time, start_time + duration))
+
+        return overlays
+
+    def write_video_ffmpeg(self, frame_paths, image_duration, target_duration, fps, output_filepath, audio_path=None, overlays=None, preset="medium", threads=0, progress_callback=None):
+        """
+        Encodes a repeating slideshow straight to MP4 with ffmpeg.
+
+        The frames are fed through ffmpeg's concat demuxer, so no frame passes
+        through Python. Without overlays, one pass over the images is encoded
+        and then looped with `-stream_loop` and stream copy to fill the target
+        duration. Static overlays, such as music attributions, are composited
+        by ffmpeg over the looped images instead. This is used when the
+        slideshow needs no transitions or timer.
+
+        Args:
+            frame_paths (list): Standardized frames from `standardize_images`.
+            image_duration (int): The duration (in seconds) of each image.
+            target_duration (float): The total duration (in seconds) of the video.
+            fps (int): The frames per second for the output video.
+            output_filepath (str): Where to write the MP4 file.
+            audio_path (str, optional): Soundtrack of at least `target_duration`.
+                                        Defaults to a silent track.
+            overlays (list, optional): Overlays from `render_attribution_overlays`.
+            preset (str, optional): The libx264 preset. Defaults to 'medium'.
+            threads (int, optional): Encoder threads; 0 uses every core. Defaults to 0.
+            progress_callback (callable, optional): Called with an int percentage.
+
+        Raises:
+            RuntimeError: If ffmpeg fails to encode the video.
+        """
+        sequence_duration = len(frame_paths) * image_duration
+        num_repeats = math.ceil(target_duration / sequence_duration) if sequence_duration > 0 else 1
+
+        audio_input = ["-i", audio_path] if audio_path else ["-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo"]
+
+        # Every image is held for seconds at a time: tune x264 for still
+        # content and allow keyframes up to ten seconds apart.
+        video_codec = [
+            "-c:v", "libx264", "-preset", preset, "-threads", str(threads),
+            "-tune", "stillimage", "-g", str(max(1, round(fps * 10))),
+        ]
+
+        # Each overlay image is looped as its own input and shown only
+        # between its start and end times.
+        overlay_inputs = []
+        filters = [f"[0:v]fps={fps}[v0]"]
+        for i, (image_path, (x, y), start, end) in enumerate(overlays or []):
+            overlay_inputs += ["-loop", "1", "-i", image_path]
+            filters.append(f"[v{i}][{i + 2}:v]overlay=x={x}:y={y}:enable='between(t,{start},{end})'[v{i + 1}]")
+        filters.append(f"[v{len(overlay_inputs) // 4}]format=yuv420p[v]")
+
+        # The list covers one pass over the images; ffmpeg loops it as needed.
+        # Frames may live in the shared frame cache, so the list goes elsewhere.
+        with tempfile.NamedTemporaryFile('w', suffix=".txt", encoding='utf-8') as f:
+            for path in frame_paths:
+                # Escape single quotes for the concat demuxer's quoting rules
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\nduration {image_duration}\n")
+            # The last entry's duration is only honoured if the file is listed again
+            f.write(f"file '{escaped}'\n")
+            f.flush()
+
+            if num_repeats > 1 and not overlays:
+                # Every repeat is identical, so encode a single pass over the
+                # images and loop the compressed packets. Overlays fall at
+                # different points in each repeat, so they need the full encode.
+                with tempfile.NamedTemporaryFile(suffix=".mp4") as sequence:
+                    run_ffmpeg(
+                        [
+                            "-f", "concat", "-safe", "0", "-i", f.name,
+                            "-vf", f"fps={fps},format=yuv420p",
+                            *video_codec,
+                            # No B-frames, so -t can cut the copied stream on an exact frame
+                            "-bf", "0",
+                            "-an", "-t", str(sequence_duration),
+                            sequence.name
+                        ],
+                        duration=sequence_duration,
+                        progress_callback=progress_callback
+                    )
+                    run_ffmpeg(
+                        [
+                            "-stream_loop", str(num_repeats - 1), "-i", sequence.name,
+                            *audio_input,
+                            "-map", "0:v", "-map", "1:a",
+                            "-c:v", "copy",
+                            "-c:a", "aac", "-ar", "44100",
+                            "-t", str(target_duration),
+                            output_filepath
+                        ]
+                    )
+                return
+
+            run_ffmpeg(
+                [
+                    "-stream_loop", str(num_repeats - 1),
+                    "-f", "concat", "-safe", "0", "-i", f.name,
+                    *audio_input,
+                    *overlay_inputs,
+                    "-filter_complex", ";".join(filters),
+                    "-map", "[v]", "-map", "1:a",
+                    *video_codec,
+                    "-c:a", "aac", "-ar", "44100",
+                    "-t", str(target_duration),
+                    output_filepath
+                ],
+                duration=target_duration,
+                progress_callback=progress_callback
+            )
+
+    def append_video_ffmpeg(self, slideshow_path, video_path, fps, output_filepath, video_has_audio=True, total_duration=None, preset="medium", threads=0, progress_callback=None):
+        """
+        Joins an encoded slideshow and an append video with a single ffmpeg call.
+
+        ffmpeg's concat filter scales the append video to `target_size` and
+        `fps` and re-encodes the result, so no frame passes through Python.
+        Stream copy isn't used, because the append video is an arbitrary file
+        whose codec and resolution rarely match the slideshow.
+
+        Args:
+            slideshow_path (str): The slideshow MP4 from `write_video_ffmpeg`.
+            video_path (str): The video file to append.
+            fps (float): The frames per second for the output video.
+            output_filepath (str): Where to write the MP4 file.
+            video_has_audio (bool, optional): Whether the append video has an
+                                              audio track. Silence is used if not.
+            total_duration (float, optional): The expected output duration, for progress.
+            preset (str, optional): The libx264 preset. Defaults to 'medium'.
+            threads (int, optional): Encoder threads; 0 uses every core. Defaults to 0.
+            progress_callback (callable, optional): Called with an int percentage.
+
+        Raises:
+            RuntimeError: If ffmpeg fails to encode the video.
+        """
+        width, height = self.target_size
+        silence_input = [] if video_has_audio else ["-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo"]
+        append_audio = "[1:a]" if video_has_audio else "[2:a]"
+
+        filters = ";".join([
+            f"[1:v]scale={width}:{height},setsar=1,fps={fps},format=yuv420p[av]",
+            f"{append_audio}aresample=44100,aformat=channel_layouts=stereo[aa]",
+            "[0:v][0:a][av][aa]concat=n=2:v=1:a=1[v][a]",
+        ])
+        run_ffmpeg(
+            [
+                "-i", slideshow_path,
+                "-i", video_path,
+                *silence_input,
+                "-filter_complex", filters,
+                "-map", "[v]", "-map", "[a]",
+                "-c:v", "libx264", "-preset", preset, "-threads", str(threads),
+                "-c:a", "aac", "-ar", "44100",
+                *(["-t", str(total_duration)] if total_duration else []),
+                output_filepath
+            ],
+            duration=total_duration,
+            progress_callback=progress_callback
+        )
+
     def load_append_video(self, video_path):
         """
         Loads and prepares a video clip to be appended to the slideshow.
@@ -7,19 +7,24 @@ the `VideoEngine` class to encapsulate the end-to-end production workflow.
 """
 
 import os
-import glob
+import contextlib
+import hashlib
 import shutil
+import subprocess
 import tempfile
 import math
+import queue
+import threading
 import asyncio
+from moviepy.config import get_setting
 from moviepy.editor import concatenate_videoclips
-from moviepy.video.io.ffmpeg_writer import ffmpeg_write_video
 
 from nextcloud_client import sort_key
 from audio_manager import AudioManager
 from slideshow_generator import SlideshowGenerator
 from video_utils import make_silent_audio
 from health_manager import get_status_logger
+from version import __version__
 
 class VideoEngine:
     """
@@ -32,6 +37,9 @@ class VideoEngine:
     4. Composing the final video with optional appends.
     5. Writing the output and uploading to Nextcloud.
     """
+    # Rendered frames buffered between compositing and the ffmpeg writer thread
+    FRAME_QUEUE_SIZE = 8
+
     def __init__(self, config, nextcloud_client=None, target_size=(1920, 1080), health_mgr=None):
         """
         Initializes the VideoEngine.
@@ -103,13 +111,19 @@ class VideoEngine:
                 raise ValueError(f"Nextcloud upload destination directory does not exist: {parent_dir}")
         
         print("Resources and paths validated successfully.")
-    async def create_slideshow(self, output_filepath, status_callback=None):
+    async def create_slideshow(self, output_filepath, status_callback=None, force=False):
         """
         Executes the full slideshow generation workflow.
 
+        If every input (images, music, append video and video settings) is
+        unchanged since the video at `output_filepath` was built, encoding is
+        skipped and the existing file is reused. A reused video keeps the music
+        shuffled for the build that made it; `force` picks a new selection.
+
         Args:
             output_filepath (str): Local path where the final video file will be saved.
             status_callback (callable, optional): Async function(message, stage) for progress updates.
+            force (bool, optional): Rebuild even if the inputs are unchanged. Defaults to False.
 
         Returns:
             list: A list of basenames of the images included in the slideshow.
@@ -130,6 +144,25 @@ class VideoEngine:
 
             included_slides = [os.path.basename(p) for p in image_paths]
 
+            # Music is listed once, for both the manifest and the soundtrack
+            music_files = await asyncio.to_thread(
+                self.audio_mgr.source_music_files,
+                self.config.music_folder, self.config.music_source, temp_dirs
+            )
+
+            # Skip the whole build if nothing it depends on has changed
+            manifest = await asyncio.to_thread(self._input_manifest, image_paths, music_files)
+            manifest_path = output_filepath + ".manifest"
+            if not force and manifest and os.path.exists(output_filepath) and self._read_manifest(manifest_path) == manifest:
+                print("Inputs unchanged since the last build; reusing the existing video.")
+                if status_callback:
+                    await status_callback("♻️ Slides, music and settings are unchanged; reusing the existing video.", "reused")
+                await self._upload_output(output_filepath, status_callback, skip_if_present=True)
+                return included_slides
+            # The old manifest no longer describes the file about to be written
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(manifest_path)
+
             # 2. Prepare Append Video
             if self.config.append_video_path:
                 if self.health_mgr:
@@ -150,77 +183,212 @@ class VideoEngine:
 
             # 4. Generate Slideshow & Audio
             slideshow_video = None
+            slideshow_audio = None
             if slideshow_target_duration > 0:
-                if self.health_mgr:
-                    self.health_mgr.update_status("Generating", "Creating slideshow video")
-                slideshow_video = await asyncio.to_thread(
-                    self.generator.create_video, 
-                    image_paths, self.config.image_duration, slideshow_target_duration, fps,
-                    transition_enabled=self.config.transition_enabled,
-                    transition_duration=self.config.transition_duration
-                )
-                
                 if self.health_mgr:
                     self.health_mgr.update_status("Generating", "Preparing background music")
                 slideshow_audio, music_attributions = await asyncio.to_thread(
                     self.audio_mgr.prepare_background_music,
-                    self.config.music_folder, self.config.music_source, slideshow_target_duration, temp_dirs
+                    music_files, slideshow_target_duration, temp_dirs
                 )
-                
-                if not slideshow_audio:
-                    slideshow_audio = make_silent_audio(slideshow_target_duration)
-                    music_attributions = []
-                
-                slideshow_video = slideshow_video.set_audio(slideshow_audio)
 
-            # 5. Final Composition
-            final_video = self._compose_final(slideshow_video, append_video_clip, fps)
-            
-            # Apply Music Attributions if any
-            if music_attributions:
-                print(f"Applying {len(music_attributions)} music attribution overlays...")
-                final_video = await asyncio.to_thread(
-                    self.generator.apply_music_attributions,
-                    final_video,
-                    music_attributions,
-                    display_duration=15
+            # A slideshow without transitions or a timer is encoded by ffmpeg
+            # directly from the images, bypassing MoviePy. An append video is
+            # then joined on by ffmpeg as well.
+            direct_render = (
+                slideshow_target_duration > 0
+                and not self.config.transition_enabled
+                and not self.config.enable_timer
+            )
+
+            if direct_render:
+                if self.health_mgr:
+                    self.health_mgr.update_status("Generating", "Creating slideshow video")
+                slideshow_path = output_filepath
+                if append_video_clip:
+                    slideshow_dir = tempfile.mkdtemp()
+                    temp_dirs.append(slideshow_dir)
+                    slideshow_path = os.path.join(slideshow_dir, "slideshow.mp4")
+
+                await asyncio.to_thread(
+                    self._write_slideshow_direct,
+                    image_paths, slideshow_target_duration, fps, slideshow_audio, music_attributions,
+                    slideshow_path, temp_dirs
                 )
-            
-            # Apply Timer Overlay if enabled
-            if self.config.enable_timer:
-                timer_start_at = max(0, final_video.duration - (self.config.timer_minutes * 60))
-                print(f"Timer enabled: Overlaying countdown starting at {timer_start_at}s (last {self.config.timer_minutes} mins)")
+
+                if append_video_clip:
+                    progress_callback = None
+                    if self.health_mgr:
+                        self.health_mgr.update_status("Encoding", f"Appending {os.path.basename(local_video_path)}")
+                        progress_callback = self.health_mgr.update_progress
+                    await asyncio.to_thread(
+                        self.generator.append_video_ffmpeg,
+                        slideshow_path, local_video_path, fps, output_filepath,
+                        video_has_audio=append_video_clip.audio is not None,
+                        total_duration=slideshow_target_duration + append_video_clip.duration,
+                        preset=self.config.x264_preset, threads=self.config.x264_threads,
+                        progress_callback=progress_callback
+                    )
+            else:
+                if slideshow_target_duration > 0:
+                    if self.health_mgr:
+                        self.health_mgr.update_status("Generating", "Creating slideshow video")
+                    # Pre-size the frames in the process pool and frame cache, so
+                    # create_video only has to load them.
+                    frame_paths = await asyncio.to_thread(self._standardize_images, image_paths, temp_dirs)
+                    slideshow_video = await asyncio.to_thread(
+                        self.generator.create_video, 
+                        frame_paths, self.config.image_duration, slideshow_target_duration, fps,
+                        transition_enabled=self.config.transition_enabled,
+                        transition_duration=self.config.transition_duration
+                    )
+                    
+                    if slideshow_video:
+                        if not slideshow_audio:
+                            music_attributions = []
+                            # A silent track is only needed to keep the join with the
+                            # append video in sync; otherwise ffmpeg generates silence.
+                            if append_video_clip:
+                                slideshow_audio = make_silent_audio(slideshow_target_duration)
+
+                        if slideshow_audio:
+                            slideshow_video = slideshow_video.set_audio(slideshow_audio)
+
+                # 5. Final Composition
+                final_video = self._compose_final(slideshow_video, append_video_clip, fps)
+                
+                # Apply Music Attributions if any
+                if music_attributions:
+                    print(f"Applying {len(music_attributions)} music attribution overlays...")
+                    final_video = await asyncio.to_thread(
+                        self.generator.apply_music_attributions,
+                        final_video,
+                        music_attributions,
+                        display_duration=15
+                    )
+                
+                # Apply Timer Overlay if enabled
+                if self.config.enable_timer:
+                    timer_start_at = max(0, final_video.duration - (self.config.timer_minutes * 60))
+                    print(f"Timer enabled: Overlaying countdown starting at {timer_start_at}s (last {self.config.timer_minutes} mins)")
+                    
+                    final_video = await asyncio.to_thread(
+                        self.generator.apply_timer_overlay,
+                        final_video, 
+                        start_time_offset=timer_start_at, 
+                        total_duration=final_video.duration,
+                        position=self.config.timer_position
+                    )
                 
-                final_video = await asyncio.to_thread(
-                    self.generator.apply_timer_overlay,
-                    final_video, 
-                    start_time_offset=timer_start_at, 
-                    total_duration=final_video.duration,
-                    position=self.config.timer_position
+                # 6. Export and Upload
+                # Without an append video the soundtrack is exactly the background
+                # music file, so ffmpeg can read it directly.
+                soundtrack = None if append_video_clip else getattr(slideshow_audio, "filename", None)
+                await asyncio.to_thread(
+                    self.write_video_manually, final_video, output_filepath, fps,
+                    health_mgr=self.health_mgr, audio_path=soundtrack,
+                    preset=self.config.x264_preset, threads=self.config.x264_threads
                 )
             
-            # 6. Export and Upload
-            await asyncio.to_thread(self.write_video_manually, final_video, output_filepath, fps, health_mgr=self.health_mgr)
-            
             if status_callback:
                 filename = os.path.basename(output_filepath)
                 await status_callback(f"💾 Video file successfully written to local storage: `{filename}`", "written")
             
-            if self.nc_client and self.config.nextcloud_upload_path:
-                if self.health_mgr:
-                    self.health_mgr.update_status("Uploading", f"Uploading to {self.config.nextcloud_upload_path}")
-                await asyncio.to_thread(self.nc_client.upload_file, output_filepath, self.config.nextcloud_upload_path)
-                if status_callback:
-                    await status_callback(f"☁️ Video successfully uploaded to Nextcloud: `{self.config.nextcloud_upload_path}`", "uploaded")
-                
+            await self._upload_output(output_filepath, status_callback)
+
+            # Only recorded once uploaded, so a failed upload is retried by the next run
+            if manifest:
+                with open(manifest_path, 'w', encoding='utf-8') as f:
+                    f.write(manifest)
             return included_slides
 
         finally:
             if append_video_clip:
                 append_video_clip.close()
-            for d in temp_dirs:
-                if os.path.exists(d):
-                    shutil.rmtree(d)
+            # Removing downloads and frames can be slow on network storage and
+            # nothing waits on it, so it happens in the background.
+            if temp_dirs:
+                threading.Thread(
+                    target=self._remove_dirs, args=(list(temp_dirs),), name="temp-cleanup"
+                ).start()
+
+    @staticmethod
+    def _remove_dirs(dirs):
+        """Internal helper to delete temporary directories, ignoring any already gone."""
+        for d in dirs:
+            shutil.rmtree(d, ignore_errors=True)
+
+    async def _upload_output(self, output_filepath, status_callback=None, skip_if_present=False):
+        """
+        Internal helper to upload the finished video to Nextcloud, if configured.
+
+        Args:
+            output_filepath (str): The local video file.
+            status_callback (callable, optional): Async function(message, stage) for progress updates.
+            skip_if_present (bool, optional): Don't upload if the upload path already exists.
+        """
+        upload_path = self.config.nextcloud_upload_path
+        if not self.nc_client or not upload_path:
+            return
+        if skip_if_present and await asyncio.to_thread(self.nc_client.check_path_exists, upload_path):
+            return
+
+        if self.health_mgr:
+            self.health_mgr.update_status("Uploading", f"Uploading to {upload_path}")
+        await asyncio.to_thread(self.nc_client.upload_file, output_filepath, upload_path)
+        if status_callback:
+            await status_callback(f"☁️ Video successfully uploaded to Nextcloud: `{upload_path}`", "uploaded")
+
+    def _input_manifest(self, image_paths, music_files):
+        """
+        Internal helper to fingerprint everything the output video depends on.
+
+        Files are identified by name, size and modification time. Nextcloud
+        files live in the download cache, where they are only rewritten when
+        their ETag changes; files downloaded to a temporary directory instead
+        get new times on every run, so never match. The remote append video
+        is identified by its ETag.
+
+        Args:
+            image_paths (list): Paths of the slideshow images.
+            music_files (list): Paths of the music and metadata files.
+
+        Returns:
+            str: A SHA-256 hex digest, or None if an input can't be identified.
+        """
+        entries = [
+            __version__, self.target_size,
+            self.config.image_duration, self.config.target_video_duration,
+            self.config.transition_enabled, self.config.transition_duration,
+            self.config.enable_timer, self.config.timer_minutes, self.config.timer_position,
+            self.config.x264_preset, self.config.x264_threads,
+        ]
+
+        for path in [*image_paths, *sorted(music_files)]:
+            st = os.stat(path)
+            entries.append((os.path.basename(path), st.st_size, st.st_mtime_ns))
+
+        append_path = self.config.append_video_path
+        if append_path:
+            if self.config.append_video_source == "nextcloud" and self.nc_client:
+                etag = self.nc_client.get_etag(append_path)
+                if not etag:
+                    return None
+                entries.append((append_path, etag))
+            elif os.path.exists(append_path):
+                st = os.stat(append_path)
+                entries.append((append_path, st.st_size, st.st_mtime_ns))
+
+        return hashlib.sha256(repr(entries).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read_manifest(manifest_path):
+        """Internal helper to read a stored manifest digest, or None if there isn't one."""
+        try:
+            with open(manifest_path, encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
 
     def _source_images(self, temp_dirs):
         """Internal helper to retrieve image paths from local or Nextcloud."""
@@ -236,17 +404,72 @@ class VideoEngine:
             return image_paths
         else:
             print(f"Retrieving images from local folder: {self.config.image_folder}")
-            image_paths = []
-            for ext in extensions:
-                image_paths.extend(glob.glob(os.path.join(self.config.image_folder, f"*{ext}")))
-                # Also handle uppercase extensions for local files
-                image_paths.extend(glob.glob(os.path.join(self.config.image_folder, f"*{ext.upper()}")))
-            
-            # Remove duplicates if any (e.g. .JPG vs .jpg if OS is case-insensitive but glob isn't)
-            image_paths = list(set(image_paths))
+            # Single, case-insensitive directory scan instead of a glob per extension and case
+            with os.scandir(self.config.image_folder) as entries:
+                image_paths = [
+                    e.path for e in entries
+                    if e.is_file() and e.name.lower().endswith(extensions)
+                ]
             image_paths.sort(key=sort_key)
             return image_paths
 
+    def _standardize_images(self, image_paths, temp_dirs):
+        """Internal helper to resize images to frames, via the frame cache where possible."""
+        frame_dir = tempfile.mkdtemp()
+        temp_dirs.append(frame_dir)
+        return self.generator.standardize_images(image_paths, frame_dir)
+
+    def _write_slideshow_direct(self, image_paths, duration, fps, audio_clip, music_attributions, output_filepath, temp_dirs):
+        """
+        Internal helper to encode a plain slideshow with ffmpeg, without MoviePy.
+
+        Args:
+            image_paths (list): Source image paths, in display order.
+            duration (float): The slideshow duration in seconds.
+            fps (int): The output frame rate.
+            audio_clip (AudioFileClip, optional): The background music, or None for silence.
+            music_attributions (list): (start_time, metadata_text) tuples to overlay.
+            output_filepath (str): Where to write the MP4 file.
+            temp_dirs (list): List to which the frame directory is appended for cleanup.
+
+        Raises:
+            RuntimeError: If no images could be processed or ffmpeg fails.
+        """
+        frame_paths = self._standardize_images(image_paths, temp_dirs)
+        if not frame_paths:
+            raise RuntimeError("No video content created.")
+
+        overlays = []
+        if music_attributions:
+            print(f"Rendering {len(music_attributions)} music attribution overlays...")
+            overlay_dir = tempfile.mkdtemp()
+            temp_dirs.append(overlay_dir)
+            overlays = self.generator.render_attribution_overlays(
+                music_attributions, overlay_dir, duration, display_duration=15
+            )
+
+        print(f"Writing video to {output_filepath} (Duration: {duration}s, FPS: {fps})...")
+        output_dir = os.path.dirname(output_filepath)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        progress_callback = None
+        if self.health_mgr:
+            self.health_mgr.update_status("Encoding", "Generating final MP4")
+            progress_callback = self.health_mgr.update_progress
+
+        try:
+            self.generator.write_video_ffmpeg(
+                frame_paths, self.config.image_duration, duration, fps, output_filepath,
+                audio_path=getattr(audio_clip, "filename", None),
+                overlays=overlays,
+                preset=self.config.x264_preset, threads=self.config.x264_threads,
+                progress_callback=progress_callback
+            )
+        finally:
+            if audio_clip:
+                audio_clip.close()
+
     def _prepare_append_video(self, temp_dirs):
         """Internal helper to download append video if required."""
         local_path = self.config.append_video_path
@@ -276,9 +499,26 @@ class VideoEngine:
         return final
 
     @staticmethod
-    def write_video_manually(final_video, output_filepath, fps, health_mgr=None):
+    def write_video_manually(final_video, output_filepath, fps, health_mgr=None, audio_path=None, preset="medium", threads=0):
         """
-        Handles the manual ffmpeg writing process with progress tracking.
+        Encodes a MoviePy clip by piping its raw frames straight into ffmpeg.
+
+        The soundtrack is muxed by the same ffmpeg process. If `audio_path`
+        is given it is used as-is; otherwise the clip's audio is rendered to
+        a temporary WAV first, so it is encoded to AAC only once, by ffmpeg.
+        A clip without audio gets a silent track generated by ffmpeg.
+
+        Args:
+            final_video (VideoClip): The clip to encode.
+            output_filepath (str): Where to write the MP4 file.
+            fps (float): The output frame rate.
+            health_mgr (HealthManager, optional): Receives status and progress updates.
+            audio_path (str, optional): A file holding the clip's complete soundtrack.
+            preset (str, optional): The libx264 preset. Defaults to 'medium'.
+            threads (int, optional): Encoder threads; 0 uses every core. Defaults to 0.
+
+        Raises:
+            RuntimeError: If ffmpeg fails to encode the video.
         """
         print(f"Writing video to {output_filepath} (Duration: {final_video.duration}s, FPS: {fps})...")
         output_dir = os.path.dirname(output_filepath)
@@ -293,11 +533,71 @@ class VideoEngine:
 
         audio_temp = None
         try:
-            if final_video.audio:
-                audio_temp = tempfile.NamedTemporaryFile(suffix=".m4a", delete=False).name
-                final_video.audio.write_audiofile(audio_temp, fps=44100, codec="aac", logger=logger, verbose=False)
-            
-            ffmpeg_write_video(final_video, output_filepath, fps, codec="libx264", audiofile=audio_temp, logger=logger, verbose=False)
+            if not audio_path and final_video.audio:
+                audio_temp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False).name
+                final_video.audio.write_audiofile(audio_temp, fps=44100, codec="pcm_s16le", logger=logger, verbose=False)
+                audio_path = audio_temp
+
+            width, height = final_video.size
+            cmd = [
+                get_setting("FFMPEG_BINARY"), "-y", "-v", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            ]
+            # Without a soundtrack, ffmpeg's own silence source keeps an audio stream in the file
+            audio_input = ["-i", audio_path] if audio_path else ["-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo"]
+            cmd += [*audio_input, "-map", "0:v", "-map", "1:a", "-c:a", "aac", "-ar", "44100"]
+            cmd += [
+                "-c:v", "libx264", "-preset", preset, "-threads", str(threads), "-pix_fmt", "yuv420p",
+                "-t", str(final_video.duration), output_filepath
+            ]
+
+            total_frames = max(1, int(final_video.duration * fps))
+            # A 1080p RGB frame is ~6 MB; a large pipe buffer avoids many small writes per frame
+            bufsize = max(1 << 20, width * height * 3)
+            # stderr goes to a file so a chatty ffmpeg can never block on a full pipe
+            with tempfile.TemporaryFile() as err:
+                process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=err, bufsize=bufsize)
+
+                # Frames are composited on this thread while a writer thread feeds
+                # ffmpeg, so rendering the next frame overlaps with piping the last.
+                frames = queue.Queue(maxsize=VideoEngine.FRAME_QUEUE_SIZE)
+                write_failed = threading.Event()
+
+                def write_frames():
+                    # Keep draining after a failed write so the producer never blocks
+                    while (data := frames.get()) is not None:
+                        if write_failed.is_set():
+                            continue
+                        try:
+                            process.stdin.write(data)
+                        except OSError:
+                            write_failed.set() # ffmpeg exited early; its error is reported below
+
+                writer = threading.Thread(target=write_frames, name="ffmpeg-writer", daemon=True)
+                writer.start()
+                try:
+                    last_progress = -1
+                    for i, frame in enumerate(final_video.iter_frames(fps=fps, dtype="uint8")):
+                        if write_failed.is_set():
+                            break # Stop compositing frames nobody will read
+                        frames.put(frame.tobytes())
+                        if health_mgr:
+                            progress = min(100, (i + 1) * 100 // total_frames)
+                            if progress != last_progress:
+                                health_mgr.update_progress(progress)
+                                last_progress = progress
+                finally:
+                    frames.put(None)
+                    writer.join()
+                    with contextlib.suppress(OSError):
+                        process.stdin.close()
+                    returncode = process.wait()
+
+                if returncode != 0:
+                    err.seek(0)
+                    message = err.read().decode(errors="replace").strip()
+                    raise RuntimeError(f"ffmpeg failed (exit code {returncode}): {message}")
         finally:
-            if audio_temp and os.path.exists(audio_temp):
-                os.remove(audio_temp)
+            if audio_temp:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(audio_temp)
@@ -2,12 +2,18 @@
 Utility functions for video processing with MoviePy and Pillow.
 
 This module provides helper functions for patching MoviePy for Pillow
-compatibility, creating silent audio clips, and resizing images for
-consistent video output.
+compatibility, creating silent audio clips, resizing images for
+consistent video output, and running ffmpeg directly.
 """
 
+import contextlib
+import math
+import os
+import subprocess
+import tempfile
 import numpy as np
-from moviepy.editor import AudioClip
+from moviepy.audio.AudioClip import AudioArrayClip
+from moviepy.config import get_setting
 from PIL import Image
 
 def patch_moviepy():
@@ -33,27 +39,21 @@ def make_silent_audio(duration, fps=44100):
     This is useful for creating placeholder audio tracks or ensuring
     a consistent audio duration when compositing.
 
+    The clip is backed by a zero-stride NumPy view rather than a per-frame
+    Python callback, so MoviePy reads samples with vectorized indexing and
+    no buffer of `duration * fps` samples is ever allocated.
+
     Args:
         duration (float): The duration of the silent audio clip in seconds.
         fps (int, optional): The frames per second (sample rate) of the audio.
                              Defaults to 44100 Hz.
 
     Returns:
-        AudioClip: A MoviePy AudioClip object representing the silent audio.
+        AudioArrayClip: A MoviePy audio clip representing the silent audio.
     """
-    def make_silent_frame(t):
-        """
-        Generates a silent audio frame at time `t`.
-        Returns a stereo (2-channel) array of zeros.
-        """
-        if np.ndim(t) > 0:
-            # For an array of times (e.g., when MoviePy requests multiple frames)
-            return np.zeros((len(t), 2))
-        else:
-            # For a single time point
-            return np.zeros(2)
-    
-    return AudioClip(make_silent_frame, duration=duration, fps=fps)
+    n_samples = int(math.ceil(duration * fps))
+    silence = np.broadcast_to(np.zeros(2, dtype=np.float32), (n_samples, 2))
+    return AudioArrayClip(silence, fps=fps).set_duration(duration)
 
 def resize_image(image_path, target_size):
     """
@@ -62,6 +62,8 @@ def resize_image(image_path, target_size):
 
     The image is opened, converted to RGB, and then resized using
     `Image.ANTIALIAS` (which is mapped to `LANCZOS` or `BICUBIC` by `patch_moviepy`).
+    Large JPEGs are decoded at a reduced scale via `Image.draft`, which never
+    goes below the target size, so the image is still only ever downscaled.
 
     Args:
         image_path (str): The file path to the image to be resized.
@@ -71,8 +73,80 @@ def resize_image(image_path, target_size):
     Returns:
         PIL.Image.Image: The resized PIL Image object.
     """
-    img = Image.open(image_path).convert("RGB")
+    img = Image.open(image_path)
+    # Let libjpeg skip detail that the resize would throw away (no-op for other formats)
+    img.draft("RGB", target_size)
+    img = img.convert("RGB")
     if img.size != target_size:
         # Use Image.ANTIALIAS (patched to LANCZOS/BICUBIC) for high-quality resizing
         return img.resize(target_size, Image.ANTIALIAS)
     return img
+
+
+def standardize_image(image_path, target_size, output_path):
+    """
+    Resizes an image to the target size and saves it as a PNG frame.
+
+    Module-level so it can run in a worker process; spawned workers start
+    without the Pillow patch, so it is applied here as well.
+
+    Args:
+        image_path (str): The file path to the source image.
+        target_size (tuple): The (width, height) of the output frame.
+        output_path (str): Where to write the PNG frame, which may be in the frame cache.
+
+    Returns:
+        tuple: (frame_path, None) on success, or (None, error_message).
+    """
+    patch_moviepy()
+    # Publish atomically so a concurrent run never reads a partial cached frame
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        # Low compression: these frames are read back once by ffmpeg
+        resize_image(image_path, target_size).save(temp_path, format="PNG", compress_level=1)
+        os.replace(temp_path, output_path)
+        return output_path, None
+    except Exception as e:
+        # Don't leave a partial frame in the shared cache
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(temp_path)
+        return None, str(e)
+
+def run_ffmpeg(args, duration=None, progress_callback=None):
+    """
+    Runs ffmpeg with the given arguments, reporting encoding progress.
+
+    ffmpeg's machine-readable progress (`-progress pipe:1`) is parsed as it
+    is written, so long encodes can still drive the !status progress bar.
+
+    Args:
+        args (list): Command-line arguments following the ffmpeg binary.
+        duration (float, optional): Expected output duration in seconds, used to
+                                    turn ffmpeg's position into a percentage.
+        progress_callback (callable, optional): Called with an int percentage (0-100).
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error.
+    """
+    cmd = [get_setting("FFMPEG_BINARY"), "-y", "-v", "error", "-nostats", "-progress", "pipe:1", *args]
+    # stderr goes to a file so a chatty ffmpeg can never block on a full pipe
+    with tempfile.TemporaryFile() as err:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, text=True)
+        last_progress = -1
+        for line in process.stdout:
+            if not (progress_callback and duration and line.startswith("out_time_us=")):
+                continue
+            try:
+                position = int(line.split("=", 1)[1]) / 1_000_000
+            except ValueError:
+                continue # Reported as N/A before the first frame
+            progress = max(0, min(100, int(position / duration * 100)))
+            if progress != last_progress:
+                progress_callback(progress)
+                last_progress = progress
+        if process.wait() != 0:
+            err.seek(0)
+            message = err.read().decode(errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed (exit code {process.returncode}): {message}")
+    if progress_callback:
+        progress_callback(100)